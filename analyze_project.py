@@ -55,6 +55,12 @@ def main():
         help='输出格式 (默认: both)'
     )
 
+    parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='不输出进度信息'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -63,6 +69,9 @@ def main():
 
     args = parser.parse_args()
 
+    # 进度信息输出（--quiet 时为空操作）
+    log = (lambda *_args, **_kwargs: None) if args.quiet else print
+
     try:
         # 验证项目路径
         project_path = Path(args.project_path).resolve()
@@ -74,9 +83,9 @@ def main():
             print(f"❌ 错误: 路径不是目录: {project_path}", file=sys.stderr)
             return 1
 
-        print(f"📊 正在分析项目: {project_path.name}")
-        print(f"📁 项目路径: {project_path}")
-        print()
+        log(f"📊 正在分析项目: {project_path.name}")
+        log(f"📁 项目路径: {project_path}")
+        log()
 
         # 生成报告
         generator = ReportGenerator(project_path)
@@ -85,19 +94,19 @@ def main():
         if args.output:
             output_path = Path(args.output)
 
-        print("🔍 收集项目信息...")
+        log("🔍 收集项目信息...")
         output_files = generator.generate_report(
             output_path=output_path,
             format=args.format
         )
 
         # 显示结果
-        print("\n✅ 分析完成！\n")
+        log("\n✅ 分析完成！\n")
         print("生成的报告:")
         for format_type, file_path in output_files.items():
             print(f"  - {format_type.upper()}: {file_path}")
 
-        print("\n💡 提示: 使用浏览器打开 HTML 文件查看完整报告")
+        log("\n💡 提示: 使用浏览器打开 HTML 文件查看完整报告")
 
         return 0
 
@@ -9,49 +9,537 @@ AI 驱动的智能代码洞察 Skill
 4. 重构建议
 """
 
+import os
+import re
 import sys
 import ast
 import json
+import pickle
+import hashlib
 from pathlib import Path
-from typing import Dict, Any, List, Set
-from collections import defaultdict
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+from collections import Counter
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, repeat
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，缺失时回退到标准库 json
+    orjson = None
 
 # 添加父目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.analyzers.base import BaseAnalyzer
+from src.analyzers._io import CACHE_VERSION, write_atomic
+
+# 不参与分析的目录（虚拟环境、构建产物、第三方依赖等）
+_IGNORED_DIRS = frozenset({
+    '.git', '.venv', 'venv', '__pycache__', 'node_modules',
+    'build', 'dist', '.tox', 'site-packages',
+})
+
+# 架构模式检测使用的顶层目录关键字
+_MVC_KEYWORDS = frozenset({'models', 'views', 'controllers'})
+_LAYERED_KEYWORDS = frozenset({'api', 'service', 'repository', 'domain'})
+_MICRO_KEYWORDS = frozenset({'services', 'microservices'})
+
+# 文件数低于该阈值时串行处理，避免进程池启动开销
+_PARALLEL_MIN_FILES = 32
+
+# 单文件分析结果的磁盘缓存目录（相对项目根目录）
+_CACHE_DIR = Path('.vcu_qa_cache') / 'insight'
+
+# 代码异味阈值
+_LONG_METHOD_LINES = 50
+_MAX_PARAMETERS = 5
+_LARGE_CLASS_METHODS = 20
+
+# 代码异味文本输出模板（末尾换行即条目之间的空行）
+_SMELL_TEMPLATE = (
+    "  [{severity}] {type}\n"
+    "  文件: {file}\n"
+    "  位置: 第 {line} 行\n"
+    "  描述: {description}\n"
+    "  建议: {suggestion}\n"
+)
+
+# 默认分析预算：累计访问的 AST 节点数上限
+_DEFAULT_MAX_NODES = 200_000
+
+# 语句起始处（行首或 ; : 之后）的 def/class/import 关键字
+_DEFINITION_RE = re.compile(
+    rb'(?m)(?:^|[;:])[ \t\f]*(?:(?:async[ \t]+)?def|class|import|from)\b'
+)
+
+
+@dataclass
+class Smell:
+    """代码异味记录（使用 __slots__，避免每条记录一个 dict；可被进程池序列化）"""
+    __slots__ = ('type', 'severity', 'file', 'line', 'ident', 'ident_kind', 'description', 'suggestion')
+
+    type: str
+    severity: str
+    file: str
+    line: int
+    ident: str
+    ident_kind: str  # 'function' 或 'class'
+    description: str
+    suggestion: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式（仅在序列化时调用）"""
+        return {
+            'type': self.type,
+            'severity': self.severity,
+            'file': self.file,
+            self.ident_kind: self.ident,
+            'line': self.line,
+            'description': self.description,
+            'suggestion': self.suggestion,
+        }
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """json.dumps 的 default 回调，序列化洞察中的记录对象"""
+    # 按 to_dict 鸭子类型判断：以脚本运行时 Smell 可能来自 __main__ 或
+    # skills.code_insight 两个模块对象（例如从缓存反序列化得到）
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _print_json(obj: Any) -> None:
+    """
+    以缩进 JSON 输出洞察结果到标准输出
+
+    安装了 orjson 时直接写入 UTF-8 字节，跳过标准输出的文本编码；
+    否则使用标准库 json。
+    """
+    if orjson is not None:
+        # Smell 需经 to_dict 输出旧字段名，不使用 orjson 内置的 dataclass 序列化
+        data = orjson.dumps(
+            obj,
+            default=_to_jsonable,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2, ensure_ascii=False, default=_to_jsonable))
+
+
+class _InsightVisitor(ast.NodeVisitor):
+    """
+    单遍 AST 访问器：一次遍历把函数、类、导入信息写入分桶
+
+    表达式节点中不可能出现函数、类定义或导入语句，因此不再逐个分派访问，
+    而是用一次轻量扫描遍历表达式子树；位于函数体内时同时收集调用名和 yield。
+    node_count 记录访问过的节点数，每个节点恰好计一次。
+    """
+
+    def __init__(self, relative_path: str, buckets: Dict[str, list]):
+        self.relative_path = relative_path
+        self.buckets = buckets
+        self.node_count = 0
+        # 函数作用域栈，每项为 [调用名集合, 是否包含 yield]
+        self._scopes = []
+
+    def visit_Module(self, node: ast.Module):
+        self.node_count += 1
+        self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.expr):
+                # 表达式子树（含根节点）由 _scan_expr 计数
+                self._scan_expr(child)
+            else:
+                self.node_count += 1
+                self.visit(child)
+
+    def _scan_expr(self, node: ast.expr):
+        """扫描表达式子树并计数，位于函数内时记录调用名与 yield"""
+        # 热循环：预先绑定局部变量，减少属性与全局名查找
+        stack = [node]
+        pop = stack.pop
+        extend = stack.extend
+        iter_child_nodes = ast.iter_child_nodes
+
+        if not self._scopes:
+            # 模块或类体中的表达式：只计数
+            while stack:
+                self.node_count += 1
+                extend(iter_child_nodes(pop()))
+            return
+
+        scope = self._scopes[-1]
+        call_names = scope[0]
+        Call, Name, Yield = ast.Call, ast.Name, ast.Yield
+        while stack:
+            current = pop()
+            self.node_count += 1
+            # AST 节点类型不会被继承，直接比较类型对象即可
+            node_type = type(current)
+            if node_type is Call:
+                func = current.func
+                if type(func) is Name:
+                    call_names.add(func.id)
+            elif node_type is Yield:
+                scope[1] = True
+            extend(iter_child_nodes(current))
+
+    def _visit_scope(self, node: ast.AST) -> list:
+        """在新的函数作用域中访问子节点，嵌套函数的结果并入外层作用域"""
+        scope = [set(), False]
+        self._scopes.append(scope)
+        self.generic_visit(node)
+        self._scopes.pop()
+
+        if self._scopes:
+            parent = self._scopes[-1]
+            parent[0] |= scope[0]
+            parent[1] = parent[1] or scope[1]
+        return scope
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        name = sys.intern(node.name)
+        record = {
+            'file': self.relative_path,
+            'function': name,
+            'line': node.lineno,
+            'is_recursive': False,
+            'is_generator': False,
+            'decorators': [sys.intern(d.id) for d in node.decorator_list if isinstance(d, ast.Name)],
+        }
+        self.buckets['functions'].append(record)
+
+        # 在各工作进程内直接按阈值生成异味记录，主进程无需再遍历全部函数
+        length = node.end_lineno - node.lineno
+        if length > _LONG_METHOD_LINES:
+            self.buckets['smells'].append(Smell(
+                type='Long Method',
+                severity='medium',
+                file=self.relative_path,
+                line=node.lineno,
+                ident=name,
+                ident_kind='function',
+                description=f'函数过长 ({length} 行)',
+                suggestion='考虑将函数拆分为更小的函数'
+            ))
+
+        param_count = len(node.args.args)
+        if param_count > _MAX_PARAMETERS:
+            self.buckets['smells'].append(Smell(
+                type='Too Many Parameters',
+                severity='low',
+                file=self.relative_path,
+                line=node.lineno,
+                ident=name,
+                ident_kind='function',
+                description=f'参数过多 ({param_count} 个)',
+                suggestion='考虑使用参数对象或配置类'
+            ))
+
+        call_names, has_yield = self._visit_scope(node)
+        record['is_recursive'] = node.name in call_names
+        record['is_generator'] = has_yield
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self.buckets['async_functions'].append({
+            'file': self.relative_path,
+            'function': sys.intern(node.name),
+            'line': node.lineno
+        })
+        self._visit_scope(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        name = sys.intern(node.name)
+        method_count = sum(1 for n in node.body if isinstance(n, ast.FunctionDef))
+        if method_count > _LARGE_CLASS_METHODS:
+            self.buckets['smells'].append(Smell(
+                type='Large Class',
+                severity='high',
+                file=self.relative_path,
+                line=node.lineno,
+                ident=name,
+                ident_kind='class',
+                description=f'类过大 ({method_count} 个方法)',
+                suggestion='考虑拆分类或使用组合模式'
+            ))
+
+        self.buckets['classes'].append({
+            'file': self.relative_path,
+            'class': name,
+            'line': node.lineno,
+            'has_bases': bool(node.bases),
+            'bases': [sys.intern(b.id) for b in node.bases if isinstance(b, ast.Name)],
+            'decorators': [sys.intern(d.id) for d in node.decorator_list if isinstance(d, ast.Name)],
+        })
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self.buckets['imports'].append((self.relative_path, sys.intern(alias.name)))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module:
+            self.buckets['imports'].append((self.relative_path, sys.intern(node.module)))
+
+
+def _new_buckets() -> Dict[str, list]:
+    """创建空的分析数据分桶"""
+    return {
+        'smells': [],
+        'functions': [],
+        'async_functions': [],
+        'classes': [],
+        'imports': [],
+    }
+
+
+def _quick_scan(source: bytes) -> bool:
+    """
+    字节级预筛：判断文件是否可能包含函数、类或导入
+
+    不含任何 def/class/import 语句的文件不会产生分析数据，可跳过 AST 解析。
+    """
+    return _DEFINITION_RE.search(source) is not None
+
+
+def _load_cached_buckets(cache_file: Path, key: str) -> Optional[Tuple[Dict[str, list], int]]:
+    """读取缓存的分桶数据与节点数，键不匹配或读取失败时返回 None"""
+    try:
+        with open(cache_file, 'rb') as f:
+            version, cached_key, buckets, node_count = pickle.load(f)
+    except Exception:
+        return None
+
+    if version != CACHE_VERSION or cached_key != key:
+        return None
+    return buckets, node_count
+
+
+def _store_cached_buckets(cache_file: Path, key: str, buckets: Dict[str, list], node_count: int) -> None:
+    """写入分桶数据缓存（原子替换，失败时静默忽略）"""
+    try:
+        payload = (CACHE_VERSION, key, buckets, node_count)
+        write_atomic(cache_file, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        pass
+
+
+def _relative_str(file_path: Path, file_str: str, root_prefix: str) -> str:
+    """
+    计算相对项目根目录的路径字符串
+
+    路径以根目录前缀开头时直接切片，避免 relative_to 构造中间 Path 对象；
+    否则（如根目录为 '.'）回退到 relative_to。
+    """
+    if file_str.startswith(root_prefix):
+        return file_str[len(root_prefix):]
+    return str(file_path.relative_to(root_prefix))
+
+
+def _analyze_one_file(file_path: Path, project_root: Path) -> Tuple[Dict[str, list], int]:
+    """
+    分析单个文件（模块级函数，可被进程池序列化）
+
+    文件未变化（mtime 与大小一致）时直接复用磁盘缓存，跳过解析。
+
+    Args:
+        file_path: Python 文件路径
+        project_root: 项目根目录
+
+    Returns:
+        Tuple[Dict[str, list], int]: 该文件的分桶数据及访问的 AST 节点数
+    """
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return _new_buckets(), 0
+
+    file_str = str(file_path)
+    key = f"{stat.st_mtime_ns}-{stat.st_size}"
+    path_digest = hashlib.blake2b(os.fsencode(file_str), digest_size=16).hexdigest()
+    cache_file = project_root / _CACHE_DIR / f"{path_digest}.pkl"
+
+    cached = _load_cached_buckets(cache_file, key)
+    if cached is not None:
+        return cached
+
+    buckets = _new_buckets()
+    node_count = 0
+    try:
+        source = file_path.read_bytes()
+        if _quick_scan(source):
+            tree = ast.parse(source, filename=file_str)
+            # 同一文件的所有记录共享同一个路径字符串对象
+            root_prefix = os.path.join(str(project_root), '')
+            relative_path = sys.intern(_relative_str(file_path, file_str, root_prefix))
+            visitor = _InsightVisitor(relative_path, buckets)
+            visitor.visit(tree)
+            node_count = visitor.node_count
+    except Exception:
+        pass
+
+    _store_cached_buckets(cache_file, key, buckets, node_count)
+    return buckets, node_count
 
 
 class CodeInsightSkill:
     """智能代码洞察 Skill"""
 
-    def __init__(self, project_path: Path):
-        """初始化 Skill"""
+    def __init__(
+        self,
+        project_path: Path,
+        max_nodes: Optional[int] = _DEFAULT_MAX_NODES,
+        python_files: Optional[List[Path]] = None,
+        verbose: bool = True
+    ):
+        """
+        初始化 Skill
+
+        Args:
+            project_path: 项目路径
+            max_nodes: 分析预算（累计访问的 AST 节点数），None 表示不限制
+            python_files: 已扫描的 Python 文件列表（提供时跳过文件系统扫描）
+            verbose: 是否输出进度信息（批量或库调用时可关闭）
+        """
         self.project_path = Path(project_path)
+        self.max_nodes = max_nodes
+        self._python_files = python_files
+        self.verbose = verbose
+        # 带结尾分隔符的根目录字符串，用于切片得到相对路径
+        self._root_str = os.path.join(str(self.project_path), '')
         self.insights = {}
         self._analyze_code()
 
+    def _log(self, message: str):
+        """输出进度信息（verbose 关闭时不产生任何输出）"""
+        if self.verbose:
+            print(message)
+
     def _analyze_code(self):
         """深度代码分析"""
-        print("🔍 正在进行深度代码分析...")
+        self._log("🔍 正在进行深度代码分析...")
+
+        python_files = self._python_files
+        if python_files is None:
+            # 使用 ProjectAnalyzer 来扫描文件
+            from src.analyzers import ProjectAnalyzer
+            analyzer = ProjectAnalyzer(self.project_path)
+            python_files = analyzer._scan_files(pattern="*.py")
+
+        # 在读取文件之前排除第三方及生成代码，同时收集顶层目录
+        kept_files = []
+        top_dirs = set()
+        root_str = self._root_str
+        for file_path in python_files:
+            parts = _relative_str(file_path, str(file_path), root_str).split(os.sep)
+            if not _IGNORED_DIRS.isdisjoint(parts):
+                continue
+            kept_files.append(file_path)
+            if len(parts) > 1:
+                top_dirs.add(parts[0])
+        python_files = kept_files
 
-        # 使用 ProjectAnalyzer 来扫描文件
-        from src.analyzers import ProjectAnalyzer
-        analyzer = ProjectAnalyzer(self.project_path)
-        python_files = analyzer._scan_files(pattern="*.py")
+        # 单遍收集：每个文件只读取、解析一次
+        buckets = self._collect_all(python_files)
 
         self.insights = {
-            'architecture_patterns': self._detect_architecture_patterns(python_files),
-            'code_smells': self._detect_code_smells(python_files),
-            'import_graph': self._build_import_graph(python_files),
-            'function_analysis': self._analyze_functions(python_files),
-            'class_hierarchy': self._analyze_class_hierarchy(python_files),
+            'architecture_patterns': self._detect_architecture_patterns(top_dirs),
+            'code_smells': self._detect_code_smells(buckets),
+            'import_graph': self._build_import_graph(buckets),
+            'function_analysis': self._analyze_functions(buckets),
+            'class_hierarchy': self._analyze_class_hierarchy(buckets),
         }
 
-        print("✅ 深度分析完成\n")
+        self._log("✅ 深度分析完成\n")
+
+    def _collect_all(self, python_files: List[Path]) -> Dict[str, list]:
+        """
+        单遍遍历所有文件，收集各项分析所需的原始数据
+
+        Args:
+            python_files: Python 文件列表
 
-    def _detect_architecture_patterns(self, python_files: List[Path]) -> Dict[str, Any]:
-        """检测架构模式"""
+        Returns:
+            Dict[str, list]: 按类别分桶的异味、函数、类、导入记录
+        """
+        buckets = _new_buckets()
+
+        if len(python_files) < _PARALLEL_MIN_FILES:
+            analyzed = self._merge_partials(
+                (_analyze_one_file(f, self.project_path) for f in python_files), buckets
+            )
+        else:
+            try:
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    results = executor.map(
+                        _analyze_one_file,
+                        python_files,
+                        repeat(self.project_path),
+                        chunksize=16
+                    )
+                    try:
+                        analyzed = self._merge_partials(results, buckets)
+                    finally:
+                        # 预算耗尽时取消尚未开始的任务
+                        executor.shutdown(cancel_futures=True)
+            except Exception:
+                # 进程池不可用时回退到串行处理
+                buckets = _new_buckets()
+                analyzed = self._merge_partials(
+                    (_analyze_one_file(f, self.project_path) for f in python_files), buckets
+                )
+
+        if analyzed < len(python_files):
+            self._log(f"⚠️  已达到分析预算 ({self.max_nodes} 个节点)，"
+                      f"跳过剩余 {len(python_files) - analyzed} 个文件")
+
+        return buckets
+
+    def _merge_partials(
+        self,
+        results: Iterable[Tuple[Dict[str, list], int]],
+        buckets: Dict[str, list]
+    ) -> int:
+        """
+        按文件顺序合并单文件结果，累计节点数超过预算后停止
+
+        Args:
+            results: 单文件分析结果（分桶数据, 节点数）的迭代器
+            buckets: 合并目标
+
+        Returns:
+            int: 实际合并的文件数
+        """
+        visited_nodes = 0
+        merged = 0
+
+        for partial, node_count in results:
+            for key, records in partial.items():
+                buckets[key].extend(records)
+            merged += 1
+            visited_nodes += node_count
+
+            if self.max_nodes is not None and visited_nodes >= self.max_nodes:
+                break
+
+        return merged
+
+    def _detect_architecture_patterns(self, top_dirs: Set[str]) -> Dict[str, Any]:
+        """
+        检测架构模式
+
+        Args:
+            top_dirs: 包含 Python 文件的顶层目录名集合
+        """
         patterns = {
             'mvc': False,
             'mvvm': False,
@@ -60,233 +548,98 @@ class CodeInsightSkill:
             'detected_patterns': []
         }
 
-        # 检查目录结构
-        dirs = set()
-        for file in python_files:
-            parts = file.relative_to(self.project_path).parts
-            if len(parts) > 1:
-                dirs.add(parts[0])
-
         # MVC 模式检测
-        mvc_keywords = {'models', 'views', 'controllers'}
-        if mvc_keywords.issubset(dirs):
+        if _MVC_KEYWORDS.issubset(top_dirs):
             patterns['mvc'] = True
             patterns['detected_patterns'].append('MVC (Model-View-Controller)')
 
         # 分层架构检测
-        layered_keywords = {'api', 'service', 'repository', 'domain'}
-        if len(layered_keywords.intersection(dirs)) >= 2:
+        if len(_LAYERED_KEYWORDS.intersection(top_dirs)) >= 2:
             patterns['layered'] = True
             patterns['detected_patterns'].append('Layered Architecture')
 
         # 微服务检测
-        if 'services' in dirs or 'microservices' in dirs:
+        if not _MICRO_KEYWORDS.isdisjoint(top_dirs):
             patterns['microservices'] = True
             patterns['detected_patterns'].append('Microservices')
 
         return patterns
 
-    def _detect_code_smells(self, python_files: List[Path]) -> List[Dict[str, Any]]:
-        """检测代码异味"""
-        smells = []
-
-        for file_path in python_files[:20]:  # 限制分析文件数
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                tree = ast.parse(content)
-                relative_path = str(file_path.relative_to(self.project_path))
-
-                # 检测长方法
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        if hasattr(node, 'end_lineno') and hasattr(node, 'lineno'):
-                            length = node.end_lineno - node.lineno
-                            if length > 50:
-                                smells.append({
-                                    'type': 'Long Method',
-                                    'severity': 'medium',
-                                    'file': relative_path,
-                                    'function': node.name,
-                                    'line': node.lineno,
-                                    'description': f'函数过长 ({length} 行)',
-                                    'suggestion': '考虑将函数拆分为更小的函数'
-                                })
-
-                        # 检测参数过多
-                        param_count = len(node.args.args)
-                        if param_count > 5:
-                            smells.append({
-                                'type': 'Too Many Parameters',
-                                'severity': 'low',
-                                'file': relative_path,
-                                'function': node.name,
-                                'line': node.lineno,
-                                'description': f'参数过多 ({param_count} 个)',
-                                'suggestion': '考虑使用参数对象或配置类'
-                            })
-
-                    # 检测大类
-                    if isinstance(node, ast.ClassDef):
-                        methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
-                        if len(methods) > 20:
-                            smells.append({
-                                'type': 'Large Class',
-                                'severity': 'high',
-                                'file': relative_path,
-                                'class': node.name,
-                                'line': node.lineno,
-                                'description': f'类过大 ({len(methods)} 个方法)',
-                                'suggestion': '考虑拆分类或使用组合模式'
-                            })
-
-            except Exception:
-                pass
+    def _detect_code_smells(self, buckets: Dict[str, list]) -> List[Smell]:
+        """检测代码异味（阈值判断已在单文件访问阶段完成）"""
+        return list(buckets['smells'])
 
-        return smells
-
-    def _build_import_graph(self, python_files: List[Path]) -> Dict[str, List[str]]:
+    def _build_import_graph(self, buckets: Dict[str, list]) -> Dict[str, List[str]]:
         """构建导入依赖图"""
-        import_graph = defaultdict(list)
-
-        for file_path in python_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                tree = ast.parse(content)
-                relative_path = str(file_path.relative_to(self.project_path))
-
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            import_graph[relative_path].append(alias.name)
-                    elif isinstance(node, ast.ImportFrom):
-                        if node.module:
-                            import_graph[relative_path].append(node.module)
-
-            except Exception:
-                pass
-
-        return dict(import_graph)
+        # 单文件结果按文件顺序合并，同一文件的导入记录天然连续，
+        # 无需排序即可一次线性分组
+        return {
+            relative_path: [module for _, module in group]
+            for relative_path, group in groupby(buckets['imports'], key=itemgetter(0))
+        }
 
-    def _analyze_functions(self, python_files: List[Path]) -> Dict[str, Any]:
+    def _analyze_functions(self, buckets: Dict[str, list]) -> Dict[str, Any]:
         """分析函数特征"""
         analysis = {
-            'total_functions': 0,
+            'total_functions': len(buckets['functions']),
             'recursive_functions': [],
             'generator_functions': [],
-            'async_functions': [],
-            'decorators_used': defaultdict(int),
+            'async_functions': list(buckets['async_functions']),
+            'decorators_used': {},
         }
+        decorator_ids = []
 
-        for file_path in python_files[:20]:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                tree = ast.parse(content)
-                relative_path = str(file_path.relative_to(self.project_path))
-
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        analysis['total_functions'] += 1
-
-                        # 检测递归
-                        if self._is_recursive(node):
-                            analysis['recursive_functions'].append({
-                                'file': relative_path,
-                                'function': node.name,
-                                'line': node.lineno
-                            })
-
-                        # 检测生成器
-                        if any(isinstance(n, ast.Yield) for n in ast.walk(node)):
-                            analysis['generator_functions'].append({
-                                'file': relative_path,
-                                'function': node.name,
-                                'line': node.lineno
-                            })
-
-                        # 检测装饰器
-                        for decorator in node.decorator_list:
-                            if isinstance(decorator, ast.Name):
-                                analysis['decorators_used'][decorator.id] += 1
-
-                    # 检测异步函数
-                    if isinstance(node, ast.AsyncFunctionDef):
-                        analysis['async_functions'].append({
-                            'file': relative_path,
-                            'function': node.name,
-                            'line': node.lineno
-                        })
+        for func in buckets['functions']:
+            location = {
+                'file': func['file'],
+                'function': func['function'],
+                'line': func['line']
+            }
 
-            except Exception:
-                pass
+            # 检测递归
+            if func['is_recursive']:
+                analysis['recursive_functions'].append(location)
 
-        analysis['decorators_used'] = dict(analysis['decorators_used'])
-        return analysis
+            # 检测生成器
+            if func['is_generator']:
+                analysis['generator_functions'].append(location)
 
-    def _is_recursive(self, func_node: ast.FunctionDef) -> bool:
-        """检测函数是否递归"""
-        func_name = func_node.name
-        for node in ast.walk(func_node):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id == func_name:
-                    return True
-        return False
+            # 收集装饰器
+            decorator_ids.extend(func['decorators'])
+
+        # Counter 在 C 层一次性计数，直接得到最常用的前 5 个装饰器
+        analysis['decorators_used'] = dict(Counter(decorator_ids).most_common(5))
+        return analysis
 
-    def _analyze_class_hierarchy(self, python_files: List[Path]) -> Dict[str, Any]:
+    def _analyze_class_hierarchy(self, buckets: Dict[str, list]) -> Dict[str, Any]:
         """分析类继承层次"""
         hierarchy = {
-            'total_classes': 0,
+            'total_classes': len(buckets['classes']),
             'inheritance_depth': {},
             'abstract_classes': [],
             'dataclasses': [],
         }
 
-        for file_path in python_files[:20]:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                tree = ast.parse(content)
-                relative_path = str(file_path.relative_to(self.project_path))
-
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ClassDef):
-                        hierarchy['total_classes'] += 1
-
-                        # 检测继承
-                        if node.bases:
-                            base_names = []
-                            for base in node.bases:
-                                if isinstance(base, ast.Name):
-                                    base_names.append(base.id)
-                            hierarchy['inheritance_depth'][node.name] = base_names
-
-                        # 检测抽象类
-                        for decorator in node.decorator_list:
-                            if isinstance(decorator, ast.Name):
-                                if decorator.id in ['abstractmethod', 'ABC']:
-                                    hierarchy['abstract_classes'].append({
-                                        'file': relative_path,
-                                        'class': node.name,
-                                        'line': node.lineno
-                                    })
-
-                        # 检测 dataclass
-                        for decorator in node.decorator_list:
-                            if isinstance(decorator, ast.Name) and decorator.id == 'dataclass':
-                                hierarchy['dataclasses'].append({
-                                    'file': relative_path,
-                                    'class': node.name,
-                                    'line': node.lineno
-                                })
+        for cls in buckets['classes']:
+            location = {
+                'file': cls['file'],
+                'class': cls['class'],
+                'line': cls['line']
+            }
 
-            except Exception:
-                pass
+            # 检测继承
+            if cls['has_bases']:
+                hierarchy['inheritance_depth'][cls['class']] = cls['bases']
+
+            # 检测抽象类
+            for decorator_id in cls['decorators']:
+                if decorator_id in ['abstractmethod', 'ABC']:
+                    hierarchy['abstract_classes'].append(location)
+
+            # 检测 dataclass
+            for decorator_id in cls['decorators']:
+                if decorator_id == 'dataclass':
+                    hierarchy['dataclasses'].append(location)
 
         return hierarchy
 
@@ -318,13 +671,16 @@ class CodeInsightSkill:
         smells = self.insights['code_smells']
         if smells:
             output.append(f"发现 {len(smells)} 个潜在问题:\n")
+            template = _SMELL_TEMPLATE
             for smell in smells[:10]:
-                output.append(f"  [{smell['severity'].upper()}] {smell['type']}")
-                output.append(f"  文件: {smell['file']}")
-                output.append(f"  位置: 第 {smell['line']} 行")
-                output.append(f"  描述: {smell['description']}")
-                output.append(f"  建议: {smell['suggestion']}")
-                output.append("")
+                output.append(template.format(
+                    severity=smell.severity.upper(),
+                    type=smell.type,
+                    file=smell.file,
+                    line=smell.line,
+                    description=smell.description,
+                    suggestion=smell.suggestion,
+                ))
         else:
             output.append("  未发现明显的代码异味")
         output.append("")
@@ -340,11 +696,7 @@ class CodeInsightSkill:
 
         if func_analysis['decorators_used']:
             output.append("\n常用装饰器:")
-            for decorator, count in sorted(
-                func_analysis['decorators_used'].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:5]:
+            for decorator, count in func_analysis['decorators_used'].items():
                 output.append(f"  - @{decorator}: {count} 次")
         output.append("")
 
@@ -396,14 +748,14 @@ def main():
         print(f"❌ 错误: 项目路径不存在: {project_path}")
         return 1
 
-    # 初始化 Skill
-    skill = CodeInsightSkill(project_path)
+    # 初始化 Skill（JSON 输出时不打印进度信息，保证输出可直接解析）
+    skill = CodeInsightSkill(project_path, verbose=not args.json)
 
     # 获取洞察
     insights = skill.get_insights(args.category)
 
     if args.json:
-        print(json.dumps(insights, indent=2, ensure_ascii=False))
+        _print_json(insights)
     else:
         print(skill.format_insights())
 
@@ -8,8 +8,12 @@ AI 驱动的项目问答 Skill
 3. 提供智能建议和洞察
 """
 
+import os
+import re
 import sys
 import json
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
@@ -22,39 +26,80 @@ from src.analyzers import (
     DependencyAnalyzer,
     MetricsCollector
 )
+from src.analyzers.base import AnalysisResult
+
+# 问题类型关键词，按优先级排列
+_QUESTION_KEYWORDS = {
+    'structure': ['结构', '目录', '文件', '组织', 'structure', 'directory', 'file'],
+    'quality': ['质量', '复杂度', '风格', 'quality', 'complexity', 'style'],
+    'dependency': ['依赖', '包', '库', 'dependency', 'package', 'library'],
+    'score': ['评分', '分数', '等级', 'score', 'grade', 'rating'],
+    'files': ['有哪些', '包含', '列出', 'list', 'show', 'what'],
+    'improvement': ['改进', '优化', '建议', 'improve', 'optimize', 'suggest'],
+}
+
+# 每个问题类型预编译一个关键词交替正则，按优先级顺序排列。
+# 不合并为单个正则：单次 search 返回的是最靠左的匹配，会破坏类型优先级
+_QUESTION_PATTERNS = tuple(
+    (re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE), qtype)
+    for qtype, words in _QUESTION_KEYWORDS.items()
+)
+
+# 文件列表问题中可识别的扩展名，按匹配优先级排列
+_FILE_EXTENSIONS = ('.py', '.js', '.ts', '.md', '.html', '.css', '.json', '.yaml', '.yml')
 
 
 class ProjectQASkill:
     """项目问答 Skill"""
 
-    def __init__(self, project_path: Path):
+    def __init__(
+        self,
+        project_path: Path,
+        precomputed_result: Optional[AnalysisResult] = None,
+        use_cache: bool = True
+    ):
         """
         初始化 Skill
 
         Args:
             project_path: 项目路径
+            precomputed_result: 已完成的 MetricsCollector 分析结果（提供时跳过重复分析）
+            use_cache: 是否复用 MetricsCollector 磁盘缓存中输入未变化的子分析器结果
         """
         self.project_path = Path(project_path)
+        self.use_cache = use_cache
         self.context = {}
-        self._analyze_project()
+        self._all_files: Optional[List[str]] = None
+        # 分析时扫描的文件列表，供文件列表问题复用
+        self._file_index: Optional[List[Path]] = None
+        self._ext_index: Optional[Dict[str, List[str]]] = None
+        self._analyze_project(precomputed_result)
 
-    def _analyze_project(self):
+    def _analyze_project(self, precomputed_result: Optional[AnalysisResult] = None):
         """分析项目并构建上下文"""
-        print("🔍 正在分析项目...")
+        if precomputed_result is not None:
+            data = precomputed_result.data
+            errors = precomputed_result.errors
+            warnings = precomputed_result.warnings
+        else:
+            print("🔍 正在分析项目...")
 
-        # 收集项目信息
-        collector = MetricsCollector(self.project_path)
-        result = collector.analyze()
+            # 收集项目信息（缓存由 MetricsCollector 按子分析器的输入签名管理）
+            collector = MetricsCollector(self.project_path, use_cache=self.use_cache)
+            result = collector.analyze()
+            data, errors, warnings = result.data, result.errors, result.warnings
+            self._file_index = collector.file_index
 
         self.context = {
             'project_name': self.project_path.name,
             'project_path': str(self.project_path),
-            'analysis_result': result.data,
-            'errors': result.errors,
-            'warnings': result.warnings,
+            'analysis_result': data,
+            'errors': errors,
+            'warnings': warnings,
         }
 
-        print("✅ 项目分析完成\n")
+        if precomputed_result is None:
+            print("✅ 项目分析完成\n")
 
     def ask(self, question: str) -> Dict[str, Any]:
         """
@@ -85,22 +130,12 @@ class ProjectQASkill:
         else:
             return self._answer_general_question(question)
 
-    def _classify_question(self, question: str) -> str:
-        """分类问题类型"""
-        question_lower = question.lower()
-
-        # 关键词映射
-        keywords = {
-            'structure': ['结构', '目录', '文件', '组织', 'structure', 'directory', 'file'],
-            'quality': ['质量', '复杂度', '风格', 'quality', 'complexity', 'style'],
-            'dependency': ['依赖', '包', '库', 'dependency', 'package', 'library'],
-            'score': ['评分', '分数', '等级', 'score', 'grade', 'rating'],
-            'files': ['有哪些', '包含', '列出', 'list', 'show', 'what'],
-            'improvement': ['改进', '优化', '建议', 'improve', 'optimize', 'suggest'],
-        }
-
-        for qtype, words in keywords.items():
-            if any(word in question_lower for word in words):
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _classify_question(question: str) -> str:
+        """分类问题类型（结果按问题文本缓存）"""
+        for pattern, qtype in _QUESTION_PATTERNS:
+            if pattern.search(question):
                 return qtype
 
         return 'general'
@@ -128,7 +163,7 @@ class ProjectQASkill:
         structure = project_data['file_structure']
         file_types = project_data['file_type_distribution']
 
-        answer = f"""
+        parts = [f"""
 📁 项目结构分析：
 
 **基本信息**
@@ -138,16 +173,16 @@ class ProjectQASkill:
 - 总文件数: {structure['total_files']}
 
 **文件类型分布** (前5种)
-"""
-        for ext, count in list(file_types.items())[:5]:
-            answer += f"- .{ext}: {count} 个文件\n"
+"""]
+        for ext, count in islice(file_types.items(), 5):
+            parts.append(f"- .{ext}: {count} 个文件\n")
 
         if info.get('is_git_repo'):
-            git_info = info.get('git_info', {})
-            answer += f"\n**Git 信息**\n"
-            answer += f"- 当前分支: {git_info.get('current_branch', 'N/A')}\n"
+            git_info = info.get('git_info') or {}
+            parts.append(f"\n**Git 信息**\n")
+            parts.append(f"- 当前分支: {git_info.get('current_branch', 'N/A')}\n")
 
-        return answer.strip()
+        return "".join(parts).strip()
 
     def _answer_quality_question(self, question: str) -> Dict[str, Any]:
         """回答质量相关问题"""
@@ -164,12 +199,12 @@ class ProjectQASkill:
 
     def _format_quality_answer(self, quality_data: Dict) -> str:
         """格式化质量答案"""
-        python_analysis = quality_data.get('python_analysis', {})
-        complexity = quality_data.get('complexity_analysis', {})
-        style_issues = quality_data.get('style_issues', {})
-        best_practices = quality_data.get('best_practices', {})
+        python_analysis = quality_data.get('python_analysis') or {}
+        complexity = quality_data.get('complexity_analysis') or {}
+        style_issues = quality_data.get('style_issues') or {}
+        best_practices = quality_data.get('best_practices') or {}
 
-        answer = f"""
+        parts = [f"""
 📊 代码质量分析：
 
 **Python 代码统计**
@@ -180,13 +215,13 @@ class ProjectQASkill:
 **复杂度分析**
 - 平均复杂度: {complexity.get('average_complexity', 0)}
 - 最大复杂度: {complexity.get('max_complexity', 0)}
-"""
+"""]
 
-        high_complexity = complexity.get('high_complexity_functions', [])
+        high_complexity = complexity.get('high_complexity_functions') or []
         if high_complexity:
-            answer += f"\n⚠️ 发现 {len(high_complexity)} 个高复杂度函数\n"
+            parts.append(f"\n⚠️ 发现 {len(high_complexity)} 个高复杂度函数\n")
 
-        answer += f"""
+        parts.append(f"""
 **代码风格**
 - 总问题数: {style_issues.get('total_issues', 0)}
 
@@ -196,9 +231,9 @@ class ProjectQASkill:
 - {'✅' if best_practices.get('has_requirements') else '❌'} 依赖管理
 - {'✅' if best_practices.get('has_gitignore') else '❌'} .gitignore
 - {'✅' if best_practices.get('has_license') else '❌'} 开源许可证
-"""
+""")
 
-        return answer.strip()
+        return "".join(parts).strip()
 
     def _answer_dependency_question(self, question: str) -> Dict[str, Any]:
         """回答依赖相关问题"""
@@ -215,38 +250,39 @@ class ProjectQASkill:
 
     def _format_dependency_answer(self, dep_data: Dict) -> str:
         """格式化依赖答案"""
-        python_deps = dep_data.get('python_dependencies', {})
-        nodejs_deps = dep_data.get('nodejs_dependencies', {})
-        version_analysis = dep_data.get('version_analysis', {})
+        python_deps = dep_data.get('python_dependencies') or {}
+        nodejs_deps = dep_data.get('nodejs_dependencies') or {}
+        version_analysis = dep_data.get('version_analysis') or {}
 
-        answer = "📦 依赖分析：\n\n"
+        parts = ["📦 依赖分析：\n\n"]
 
         if python_deps.get('found'):
-            answer += f"**Python 依赖** ({python_deps.get('source', 'N/A')})\n"
-            answer += f"- 总包数: {python_deps.get('total_count', 0)}\n"
+            parts.append(f"**Python 依赖** ({python_deps.get('source', 'N/A')})\n")
+            parts.append(f"- 总包数: {python_deps.get('total_count', 0)}\n")
 
-            packages = python_deps.get('packages', [])
+            packages = python_deps.get('packages') or []
             if packages:
-                answer += "\n主要依赖:\n"
+                parts.append("\n主要依赖:\n")
                 for pkg in packages[:10]:
-                    answer += f"- {pkg['name']} {pkg.get('version_spec', '')}\n"
+                    parts.append(f"- {pkg['name']} {pkg.get('version_spec', '')}\n")
 
         if nodejs_deps.get('found'):
-            answer += f"\n**Node.js 依赖**\n"
-            answer += f"- 总包数: {nodejs_deps.get('total_count', 0)}\n"
+            parts.append(f"\n**Node.js 依赖**\n")
+            parts.append(f"- 总包数: {nodejs_deps.get('total_count', 0)}\n")
 
         if version_analysis:
-            answer += f"\n**版本管理**\n"
-            answer += f"- 固定版本: {version_analysis.get('pinned_versions', 0)}\n"
-            answer += f"- 灵活版本: {version_analysis.get('flexible_versions', 0)}\n"
-            answer += f"- 未指定版本: {version_analysis.get('latest_versions', 0)}\n"
+            parts.append(f"\n**版本管理**\n")
+            parts.append(f"- 固定版本: {version_analysis.get('pinned_versions', 0)}\n")
+            parts.append(f"- 灵活版本: {version_analysis.get('flexible_versions', 0)}\n")
+            parts.append(f"- 未指定版本: {version_analysis.get('latest_versions', 0)}\n")
 
-        return answer.strip()
+        return "".join(parts).strip()
 
     def _answer_score_question(self, question: str) -> Dict[str, Any]:
         """回答评分相关问题"""
-        score = self.context['analysis_result']['overall_score']
-        summary = self.context['analysis_result']['summary']
+        analysis = self.context['analysis_result']
+        score = analysis['overall_score']
+        summary = analysis['summary']
 
         answer = {
             'question': question,
@@ -259,27 +295,27 @@ class ProjectQASkill:
 
     def _format_score_answer(self, score: Dict, summary: Dict) -> str:
         """格式化评分答案"""
-        answer = f"""
+        parts = [f"""
 🎯 项目评分：
 
 **综合评分**: {score['total']}/100 ({score['grade']})
 
 **评分细分**
-"""
+"""]
         for category, points in score['breakdown'].items():
-            answer += f"- {category}: {points}分\n"
+            parts.append(f"- {category}: {points}分\n")
 
         if summary.get('highlights'):
-            answer += "\n**✅ 亮点**\n"
+            parts.append("\n**✅ 亮点**\n")
             for highlight in summary['highlights']:
-                answer += f"- {highlight}\n"
+                parts.append(f"- {highlight}\n")
 
         if summary.get('concerns'):
-            answer += "\n**⚠️ 需要关注**\n"
+            parts.append("\n**⚠️ 需要关注**\n")
             for concern in summary['concerns']:
-                answer += f"- {concern}\n"
+                parts.append(f"- {concern}\n")
 
-        return answer.strip()
+        return "".join(parts).strip()
 
     def _answer_files_question(self, question: str) -> Dict[str, Any]:
         """回答文件列表相关问题"""
@@ -290,70 +326,95 @@ class ProjectQASkill:
 
         if file_type:
             files = self._get_files_by_type(file_type)
-            answer_text = f"项目中的 {file_type} 文件：\n\n"
+            parts = [f"项目中的 {file_type} 文件：\n\n"]
             for f in files[:20]:
-                answer_text += f"- {f}\n"
+                parts.append(f"- {f}\n")
             if len(files) > 20:
-                answer_text += f"\n... 还有 {len(files) - 20} 个文件"
+                parts.append(f"\n... 还有 {len(files) - 20} 个文件")
         else:
-            file_list = project_data['file_structure'].get('file_list', [])
-            answer_text = f"项目文件列表（前20个）：\n\n"
+            file_list = project_data['file_structure'].get('file_list') or []
+            parts = ["项目文件列表（前20个）：\n\n"]
             for f in file_list[:20]:
-                answer_text += f"- {f}\n"
+                parts.append(f"- {f}\n")
 
         answer = {
             'question': question,
             'type': 'files',
-            'answer': answer_text.strip(),
+            'answer': "".join(parts).strip(),
             'details': {}
         }
 
         return answer
 
-    def _extract_file_type(self, question: str) -> Optional[str]:
-        """从问题中提取文件类型"""
-        extensions = ['.py', '.js', '.ts', '.md', '.html', '.css', '.json', '.yaml', '.yml']
-        for ext in extensions:
-            if ext in question.lower():
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _extract_file_type(question: str) -> Optional[str]:
+        """从问题中提取文件类型（结果按问题文本缓存）"""
+        question_lower = question.lower()
+        for ext in _FILE_EXTENSIONS:
+            if ext in question_lower:
                 return ext
         return None
 
-    def _get_files_by_type(self, file_type: str) -> List[str]:
-        """获取指定类型的文件"""
-        from src.analyzers import ProjectAnalyzer
+    def _get_all_files(self) -> List[str]:
+        """
+        获取项目全部文件的相对路径（只扫描一次）
 
-        analyzer = ProjectAnalyzer(self.project_path)
-        files = analyzer._scan_files(pattern=f"*{file_type}")
-        return [str(f.relative_to(self.project_path)) for f in files]
+        分析结果中的 file_list 完整时直接复用；
+        超出其截断上限时扫描一次文件系统并缓存。
+        """
+        if self._all_files is None:
+            project_data = self.context['analysis_result'].get('project') or {}
+            structure = project_data.get('file_structure') or {}
+            file_list = structure.get('file_list') or []
+            if len(file_list) >= structure.get('total_files', 0):
+                self._all_files = list(file_list)
+            else:
+                analyzer = ProjectAnalyzer(self.project_path, file_index=self._file_index)
+                self._all_files = [
+                    str(f.relative_to(self.project_path)) for f in analyzer._scan_files()
+                ]
+        return self._all_files
+
+    def _get_files_by_type(self, file_type: str) -> List[str]:
+        """获取指定类型的文件（首次调用时一次性按扩展名建立索引）"""
+        if self._ext_index is None:
+            ext_index: Dict[str, List[str]] = {}
+            for path in self._get_all_files():
+                ext = os.path.splitext(path)[1].lower()
+                ext_index.setdefault(ext, []).append(path)
+            self._ext_index = ext_index
+        return self._ext_index.get(file_type.lower(), [])
 
     def _answer_improvement_question(self, question: str) -> Dict[str, Any]:
         """回答改进建议相关问题"""
-        quality_data = self.context['analysis_result']['quality']
-        best_practices = quality_data.get('best_practices', {})
-        recommendations = best_practices.get('recommendations', [])
+        analysis = self.context['analysis_result']
+        quality_data = analysis['quality']
+        best_practices = quality_data.get('best_practices') or {}
+        recommendations = best_practices.get('recommendations') or []
 
-        answer_text = "💡 改进建议：\n\n"
+        parts = ["💡 改进建议：\n\n"]
 
         if recommendations:
             for i, rec in enumerate(recommendations, 1):
-                answer_text += f"{i}. {rec}\n"
+                parts.append(f"{i}. {rec}\n")
         else:
-            answer_text += "项目整体状况良好，暂无重要改进建议。\n"
+            parts.append("项目整体状况良好，暂无重要改进建议。\n")
 
         # 添加基于评分的建议
-        score = self.context['analysis_result']['overall_score']
+        score = analysis['overall_score']
         if score['total'] < 60:
-            answer_text += "\n**优先改进项**\n"
-            answer_text += "- 项目评分较低，建议优先关注代码质量和最佳实践\n"
+            parts.append("\n**优先改进项**\n")
+            parts.append("- 项目评分较低，建议优先关注代码质量和最佳实践\n")
 
-        complexity = quality_data.get('complexity_analysis', {})
+        complexity = quality_data.get('complexity_analysis') or {}
         if complexity.get('max_complexity', 0) > 15:
-            answer_text += "- 降低高复杂度函数的复杂度\n"
+            parts.append("- 降低高复杂度函数的复杂度\n")
 
         answer = {
             'question': question,
             'type': 'improvement',
-            'answer': answer_text.strip(),
+            'answer': "".join(parts).strip(),
             'details': {'recommendations': recommendations}
         }
 
@@ -362,18 +423,20 @@ class ProjectQASkill:
     def _answer_general_question(self, question: str) -> Dict[str, Any]:
         """回答一般性问题"""
         # 提供项目概览
-        summary = self.context['analysis_result']['summary']
-        score = self.context['analysis_result']['overall_score']
+        analysis = self.context['analysis_result']
+        summary = analysis['summary']
+        score = analysis['overall_score']
+        metrics = summary['key_metrics']
 
         answer_text = f"""
 关于项目 "{self.context['project_name']}" 的信息：
 
 **项目概览**
 - 评分: {score['total']}/100 ({score['grade']})
-- 总文件数: {summary['key_metrics']['total_files']}
-- 代码行数: {summary['key_metrics']['code_lines']}
-- 函数数量: {summary['key_metrics']['total_functions']}
-- 类数量: {summary['key_metrics']['total_classes']}
+- 总文件数: {metrics['total_files']}
+- 代码行数: {metrics['code_lines']}
+- 函数数量: {metrics['total_functions']}
+- 类数量: {metrics['total_classes']}
 
 您可以问我：
 - 项目结构如何？
@@ -465,6 +528,12 @@ def main():
         help='以 JSON 格式输出'
     )
 
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='忽略磁盘缓存，重新分析项目'
+    )
+
     args = parser.parse_args()
 
     # 验证项目路径
@@ -474,7 +543,7 @@ def main():
         return 1
 
     # 初始化 Skill
-    skill = ProjectQASkill(project_path)
+    skill = ProjectQASkill(project_path, use_cache=not args.no_cache)
 
     # 单个问题模式
     if args.question:
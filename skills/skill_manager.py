@@ -7,15 +7,13 @@ AI Skills 管理器
 
 import sys
 import json
+import importlib
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 # 添加父目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from skills.project_qa import ProjectQASkill
-from skills.code_insight import CodeInsightSkill
-
 
 class SkillManager:
     """Skills 管理器"""
@@ -29,25 +27,51 @@ class SkillManager:
         """
         self.project_path = Path(project_path)
         self.skills = {}
+        self._python_files = None
+        self._analysis_cache = None
         self._register_skills()
 
     def _register_skills(self):
-        """注册所有可用的 Skills"""
+        """
+        注册所有可用的 Skills
+
+        Skill 类以 "模块:类名" 形式登记，首次使用时才导入，
+        未用到的 Skill（及其依赖的分析器）不会被加载。
+        """
         self.skills = {
             'qa': {
                 'name': '项目问答',
                 'description': '回答关于项目的问题',
-                'class': ProjectQASkill,
-                'instance': None
+                'class_path': 'skills.project_qa:ProjectQASkill',
+                'instance': None,
+                'uses_analysis': True
             },
             'insight': {
                 'name': '代码洞察',
                 'description': '深度代码分析和架构洞察',
-                'class': CodeInsightSkill,
-                'instance': None
+                'class_path': 'skills.code_insight:CodeInsightSkill',
+                'instance': None,
+                'uses_python_files': True
             }
         }
 
+    def _get_python_files(self) -> List[Path]:
+        """扫描一次项目中的 Python 文件，供各 Skill 共享"""
+        if self._python_files is None:
+            from src.analyzers import ProjectAnalyzer
+            analyzer = ProjectAnalyzer(self.project_path)
+            self._python_files = analyzer._scan_files(pattern="*.py")
+        return self._python_files
+
+    def _get_analysis(self):
+        """运行一次 MetricsCollector 完整分析，供各 Skill 共享"""
+        if self._analysis_cache is None:
+            from src.analyzers import MetricsCollector
+            print("🔍 正在分析项目...")
+            self._analysis_cache = MetricsCollector(self.project_path).analyze()
+            print("✅ 项目分析完成\n")
+        return self._analysis_cache
+
     def list_skills(self) -> List[Dict[str, str]]:
         """列出所有可用的 Skills"""
         return [
@@ -77,7 +101,14 @@ class SkillManager:
         # 懒加载
         if skill_info['instance'] is None:
             print(f"🔧 正在加载 Skill: {skill_info['name']}...")
-            skill_info['instance'] = skill_info['class'](self.project_path)
+            module_name, class_name = skill_info['class_path'].split(':')
+            skill_class = getattr(importlib.import_module(module_name), class_name)
+            kwargs = {}
+            if skill_info.get('uses_python_files'):
+                kwargs['python_files'] = self._get_python_files()
+            if skill_info.get('uses_analysis'):
+                kwargs['precomputed_result'] = self._get_analysis()
+            skill_info['instance'] = skill_class(self.project_path, **kwargs)
 
         return skill_info['instance']
 
@@ -253,8 +284,9 @@ def main():
             skill = manager.get_skill('insight')
 
             if args.json:
+                from skills.code_insight import _print_json
                 insights = skill.get_insights()
-                print(json.dumps(insights, indent=2, ensure_ascii=False))
+                _print_json(insights)
             else:
                 print(skill.format_insights())
 
@@ -0,0 +1,135 @@
+"""
+AST 分析结果的持久化缓存
+
+以 SQLite 保存每个文件派生出的分析事实（函数、类、复杂度等统计），
+文件未变化时直接复用，跳过读取与解析。
+"""
+
+import hashlib
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from ._io import CACHE_VERSION, read_bytes
+
+try:
+    import xxhash
+except ImportError:  # 可选依赖，缺失时回退到 SHA-256
+    xxhash = None
+
+# 缓存数据库位置（相对项目根目录）
+_CACHE_FILE = Path('.vcu_qa_cache') / 'ast.sqlite'
+
+
+def _content_digest(data: bytes) -> bytes:
+    """计算文件内容摘要（非对抗场景，优先使用更快的 xxh3）"""
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.sha256(data).digest()
+
+
+class AstCache:
+    """按文件路径与内容哈希缓存分析事实"""
+
+    def __init__(self, project_path: Path, enabled: bool = True):
+        """
+        打开（或创建）项目的缓存数据库
+
+        数据库不可用（如项目目录只读）时缓存自动禁用，不影响分析。
+
+        Args:
+            project_path: 项目根目录路径
+            enabled: 为 False 时不打开数据库，每个文件都直接读取并重新计算
+        """
+        self._conn: Optional[sqlite3.Connection] = None
+        if not enabled:
+            return
+
+        try:
+            db_path = Path(project_path) / _CACHE_FILE
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(db_path))
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != CACHE_VERSION:
+                conn.execute('DROP TABLE IF EXISTS facts')
+                conn.execute(f'PRAGMA user_version = {CACHE_VERSION}')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS facts ('
+                'path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, '
+                'digest BLOB, facts BLOB)'
+            )
+            self._conn = conn
+        except Exception:
+            self._conn = None
+
+    def lookup(self, path: Path) -> Tuple[Any, Optional[tuple]]:
+        """
+        查找文件的缓存事实，不计算
+
+        命中时返回 (事实, None)；未命中时返回 (None, 待计算记录)，
+        待计算记录首项为文件内容，计算完成后连同事实交给 store 写回。
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            Tuple[Any, Optional[tuple]]: (分析事实, 待计算记录)
+
+        Raises:
+            OSError: 文件无法读取
+        """
+        if self._conn is None:
+            return None, (read_bytes(path), None, None)
+
+        key = str(path)
+        stat = path.stat()
+        row = self._conn.execute(
+            'SELECT mtime_ns, size, digest, facts FROM facts WHERE path = ?', (key,)
+        ).fetchone()
+
+        if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return pickle.loads(row[3]), None
+
+        data = read_bytes(path)
+        digest = _content_digest(data)
+        if row is not None and row[2] == digest:
+            # 内容未变（如仅 touch），刷新元数据后复用
+            facts = pickle.loads(row[3])
+            self.store(path, (data, stat, digest), facts)
+            return facts, None
+
+        return None, (data, stat, digest)
+
+    def store(self, path: Path, pending: tuple, facts: Any) -> None:
+        """
+        写回 lookup 未命中文件的计算结果
+
+        Args:
+            path: 文件路径
+            pending: lookup 返回的待计算记录
+            facts: 计算得到的分析事实
+        """
+        _, stat, digest = pending
+        if self._conn is None or stat is None:
+            return
+
+        try:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?)',
+                (str(path), stat.st_mtime_ns, stat.st_size, digest,
+                 pickle.dumps(facts, protocol=pickle.HIGHEST_PROTOCOL))
+            )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """提交写入并关闭数据库"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.commit()
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+        self._conn = None
@@ -0,0 +1,149 @@
+"""
+文件读取工具
+
+单个文件直接用 Path.read_bytes 读取；批量顺序读取时提前打开随后的
+若干个文件并提示内核预读，使磁盘 I/O 与当前文件的处理重叠。
+缓存文件统一经由临时文件原子替换写入。
+"""
+
+import os
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple, Union
+
+# posix_fadvise 仅在部分平台可用（Windows、macOS 上缺失）
+_HAS_FADVISE = hasattr(os, 'posix_fadvise')
+
+# read_many 提前打开并提示预读的文件数
+_READAHEAD_FILES = 8
+
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+# .vcu_qa_cache 下所有磁盘缓存共用的格式版本；
+# 任一缓存的结构或其依赖的分析逻辑变化时递增，旧缓存全部失效
+CACHE_VERSION = 5
+
+
+def _prefetch(fd: int) -> None:
+    """提示内核预读整个文件，不支持时忽略"""
+    if _HAS_FADVISE:
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+
+
+def _read_fd(fd: int) -> bytes:
+    """
+    读取文件描述符的全部内容
+
+    按 fstat 得到的大小多请求一个字节：读到的不超过该大小即已到文件末尾，
+    通常只需一次 os.read；文件在读取期间变大时继续读到末尾。
+    """
+    size = os.fstat(fd).st_size
+    data = os.read(fd, size + 1)
+    if len(data) <= size:
+        return data
+
+    chunks = [data]
+    while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def read_bytes(path: Union[Path, str]) -> bytes:
+    """
+    读取文件全部内容
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        bytes: 文件内容
+
+    Raises:
+        OSError: 文件无法打开或读取
+    """
+    return Path(path).read_bytes()
+
+
+def read_many(paths: Iterable[Path]) -> Iterator[Tuple[Path, Union[bytes, OSError]]]:
+    """
+    按顺序读取多个文件
+
+    读取当前文件时，随后的若干个文件已打开并提示内核预读，
+    磁盘 I/O 与调用方对当前内容的处理得以重叠。
+
+    Args:
+        paths: 文件路径列表
+
+    Yields:
+        Tuple[Path, Union[bytes, OSError]]: (文件路径, 内容)，读取失败时为对应的异常
+    """
+    pending = deque()
+    path_iter = iter(paths)
+
+    def open_next() -> bool:
+        for path in path_iter:
+            try:
+                fd = os.open(path, _OPEN_FLAGS)
+            except OSError as e:
+                pending.append((path, None, e))
+            else:
+                _prefetch(fd)
+                pending.append((path, fd, None))
+            return True
+        return False
+
+    try:
+        while len(pending) < _READAHEAD_FILES and open_next():
+            pass
+
+        while pending:
+            path, fd, error = pending.popleft()
+            if fd is not None:
+                try:
+                    yield path, _read_fd(fd)
+                except OSError as e:
+                    yield path, e
+                finally:
+                    os.close(fd)
+            else:
+                yield path, error
+            open_next()
+    finally:
+        # 调用方提前结束迭代时关闭已打开的文件
+        for _, fd, _ in pending:
+            if fd is not None:
+                os.close(fd)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    原子写入文件
+
+    先写入同目录下的临时文件再 os.replace 替换，读取方（包括并发运行的
+    其他进程）不会看到写了一半的内容；父目录不存在时自动创建。
+
+    Args:
+        path: 目标文件路径
+        data: 文件内容
+
+    Raises:
+        OSError: 写入或替换失败（临时文件已清理）
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, path)
+    except OSError:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,79 @@
+"""
+可选的 Numba JIT 加速
+
+安装了 numba（及 numpy）时对字节扫描内核进行 JIT 编译；
+未安装时 HAS_NUMBA 为 False，调用方使用基于正则的纯 Python 实现。
+"""
+
+from typing import Tuple
+
+try:
+    import numpy as np
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    np = None
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """numba.njit 的空实现，支持 @njit 与 @njit(...) 两种写法"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _classify_lines(buf) -> Tuple[int, int, int]:
+    """
+    单遍扫描字节缓冲区，统计总行数、空行数和注释行数
+
+    行首跳过空白（空格、\\t、\\f、\\v、\\r）后为 '#' 记为注释行，
+    到达换行或文件末尾记为空行，规则与 BaseAnalyzer 的正则实现一致。
+
+    Args:
+        buf: 文件内容（uint8 数组或 bytes）
+
+    Returns:
+        Tuple[int, int, int]: (总行数, 空行数, 注释行数)
+    """
+    n = len(buf)
+    total = 0
+    blank = 0
+    comment = 0
+    i = 0
+    while i < n:
+        j = i
+        while j < n and (buf[j] == 32 or buf[j] == 9 or buf[j] == 12
+                         or buf[j] == 11 or buf[j] == 13):
+            j += 1
+        if j >= n:
+            # 末尾没有换行的纯空白行
+            total += 1
+            blank += 1
+            break
+
+        c = buf[j]
+        if c == 35:
+            comment += 1
+        elif c == 10:
+            blank += 1
+
+        while j < n and buf[j] != 10:
+            j += 1
+        total += 1
+        i = j + 1
+
+    return total, blank, comment
+
+
+def classify_lines(data: bytes) -> Tuple[int, int, int]:
+    """
+    统计字节内容的 (总行数, 空行数, 注释行数)，仅在 HAS_NUMBA 为 True 时使用
+
+    Args:
+        data: 文件内容
+
+    Returns:
+        Tuple[int, int, int]: (总行数, 空行数, 注释行数)
+    """
+    return _classify_lines(np.frombuffer(data, dtype=np.uint8))
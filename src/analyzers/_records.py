@@ -0,0 +1,42 @@
+"""
+分析过程中使用的轻量记录类型
+
+聚合阶段以紧凑的记录对象保存问题条目，输出时再转换为字典。
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict
+
+# Python 3.10+ 的 dataclass 支持 slots，省去每个实例的 __dict__
+SLOTS_KWARGS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **SLOTS_KWARGS)
+class FileIssue:
+    """文件中的问题条目"""
+    file: str
+    issue: str
+    line: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {'file': self.file, 'issue': self.issue, 'line': self.line}
+
+
+@dataclass(frozen=True, **SLOTS_KWARGS)
+class ComplexFunction:
+    """高复杂度函数条目"""
+    file: str
+    function: str
+    complexity: int
+    line: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'file': self.file,
+            'function': self.function,
+            'complexity': self.complexity,
+            'line': self.line
+        }
@@ -4,14 +4,113 @@
 定义所有分析器的通用接口和行为。
 """
 
+import os
+import re
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from fnmatch import translate
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 from datetime import datetime
 
+from ._io import read_bytes, read_many
+from ._jit import HAS_NUMBA, classify_lines
+from ._records import SLOTS_KWARGS
 
-@dataclass
+# 默认排除的目录（含通配符的条目按 fnmatch 匹配）
+_DEFAULT_EXCLUDE_DIRS = frozenset({
+    '__pycache__', '.git', '.venv', 'venv',
+    'node_modules', '.pytest_cache', '.mypy_cache',
+    'dist', 'build', '*.egg-info', '.vcu_qa_cache',
+})
+
+# 与 fnmatch 一致：文件名大小写不敏感的平台上匹配时忽略大小写
+_GLOB_FLAGS = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+
+
+@lru_cache(maxsize=64)
+def compile_glob(pattern: str):
+    """将通配符模式编译为正则匹配函数（按模式缓存）"""
+    return re.compile(translate(pattern), _GLOB_FLAGS).match
+
+
+@lru_cache(maxsize=16)
+def _exclude_rules(exclude_names: frozenset):
+    """
+    拆分排除规则（按排除集合缓存，默认集合只处理一次）
+
+    Returns:
+        精确匹配的目录名集合，以及含通配符条目的匹配函数元组
+    """
+    matchers = tuple(
+        compile_glob(name) for name in exclude_names if any(c in name for c in '*?[')
+    )
+    return exclude_names, matchers
+
+
+# 文件大小单位，下标 i 对应 1024**i 字节
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# 批量统计行数时，文件数低于该阈值则串行处理，避免进程池/线程池开销
+_BULK_PARALLEL_MIN_FILES = 64
+
+# 行首（跳过空白后）为 '#' 的注释行，或只含空白的空行
+_BLANK_OR_COMMENT_RE = re.compile(rb'(?m)^[ \t\f\v\r]*(#|$)')
+
+
+def _line_stats(data: bytes) -> Dict[str, int]:
+    """
+    按字节统计行数，不解码、不构造逐行字符串
+
+    Args:
+        data: 文件内容
+
+    Returns:
+        Dict[str, int]: 包含总行数、代码行数、注释行数、空行数
+    """
+    if HAS_NUMBA:
+        total, blank, comment = classify_lines(data)
+    else:
+        total = data.count(b'\n')
+        if data and not data.endswith(b'\n'):
+            total += 1
+
+        matches = _BLANK_OR_COMMENT_RE.findall(data)
+        blank = matches.count(b'')
+        comment = len(matches) - blank
+        if not data or data.endswith(b'\n'):
+            # 末尾换行之后（或空文件开头）的空匹配不是一行
+            blank -= 1
+    code = total - blank - comment
+
+    return {
+        'total': total,
+        'code': code,
+        'comment': comment,
+        'blank': blank
+    }
+
+
+def _count_lines_standalone(path: str) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
+    """
+    统计单个文件的行数（供进程池调用，不依赖分析器实例）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        Tuple: (行数统计, None)，读取失败时为 (None, 错误信息)
+    """
+    try:
+        return _line_stats(read_bytes(path)), None
+    except Exception as e:
+        return None, str(e)
+
+
+@dataclass(**SLOTS_KWARGS)
 class AnalysisResult:
     """分析结果数据类"""
     analyzer_name: str
@@ -45,18 +144,32 @@ class AnalysisResult:
 class BaseAnalyzer(ABC):
     """分析器基类"""
 
-    def __init__(self, project_path: Path):
+    def __init__(
+        self,
+        project_path: Path,
+        file_index: Optional[List[Path]] = None,
+        dir_count: Optional[int] = None
+    ):
         """
         初始化分析器
 
         Args:
             project_path: 项目根目录路径
+            file_index: 按默认规则递归扫描得到的文件列表（多个分析器共享时由调用方注入）
+            dir_count: 与 file_index 同一次扫描得到的目录数
         """
         self.project_path = Path(project_path)
         if not self.project_path.exists():
             raise FileNotFoundError(f"项目路径不存在: {project_path}")
 
         self.result = AnalysisResult(analyzer_name=self.__class__.__name__)
+        # 多线程统计时保护 result 上的警告列表
+        self._result_lock = threading.Lock()
+        # 扫描结果均以该前缀开头，可直接切片得到相对路径
+        self._root_prefix = os.path.join(str(self.project_path), '')
+        # 未注入时在首次默认扫描时建立，之后的扫描只在内存中过滤
+        self.file_index = file_index
+        self.dir_count = dir_count
 
     @abstractmethod
     def analyze(self) -> AnalysisResult:
@@ -68,6 +181,23 @@ class BaseAnalyzer(ABC):
         """
         pass
 
+    def _relative_path(self, file_path: Path) -> str:
+        """
+        计算相对项目根目录的路径字符串
+
+        扫描得到的路径以根目录前缀开头时直接切片，否则回退到 relative_to。
+
+        Args:
+            file_path: 项目内的文件路径
+
+        Returns:
+            str: 相对路径
+        """
+        file_str = str(file_path)
+        if file_str.startswith(self._root_prefix):
+            return file_str[len(self._root_prefix):]
+        return str(file_path.relative_to(self.project_path))
+
     def _scan_files(
         self,
         pattern: str = "*",
@@ -85,61 +215,178 @@ class BaseAnalyzer(ABC):
         Returns:
             List[Path]: 匹配的文件列表
         """
-        if exclude_dirs is None:
-            exclude_dirs = [
-                '__pycache__', '.git', '.venv', 'venv',
-                'node_modules', '.pytest_cache', '.mypy_cache',
-                'dist', 'build', '*.egg-info'
-            ]
+        if not recursive or exclude_dirs is not None:
+            if exclude_dirs is None:
+                exclude_dirs = _DEFAULT_EXCLUDE_DIRS
+            return self._walk_files(pattern, recursive, exclude_dirs)[0]
+
+        # 默认规则的递归扫描只遍历一次文件系统
+        if self.file_index is None:
+            self.file_index, self.dir_count = self._walk_files(
+                "*", True, _DEFAULT_EXCLUDE_DIRS
+            )
+        if pattern == '*':
+            return list(self.file_index)
+        match_name = compile_glob(pattern)
+        return [f for f in self.file_index if match_name(f.name)]
+
+    def _count_directories(self) -> int:
+        """
+        获取项目目录数（不含排除的目录）
+
+        与文件索引在同一次扫描中统计；注入的文件索引未附带目录数时单独扫描一次。
+
+        Returns:
+            int: 目录数
+        """
+        if self.dir_count is None:
+            self.dir_count = self._walk_files("*", True, _DEFAULT_EXCLUDE_DIRS)[1]
+        return self.dir_count
+
+    def _walk_files(
+        self,
+        pattern: str,
+        recursive: bool,
+        exclude_dirs: Iterable[str]
+    ) -> Tuple[List[Path], int]:
+        """
+        遍历文件系统，收集匹配的文件
+
+        Args:
+            pattern: 文件匹配模式
+            recursive: 是否递归扫描
+            exclude_dirs: 排除的目录名（支持通配符）
+
+        Returns:
+            Tuple[List[Path], int]: (匹配的文件列表, 遇到的目录数)，
+            文件顺序与 glob 的先序遍历一致
+        """
+        exclude_names, exclude_matchers = _exclude_rules(frozenset(exclude_dirs))
+        # '*' 匹配所有文件名，无需逐项匹配
+        match_name = None if pattern == '*' else compile_glob(pattern)
 
         files = []
-        glob_pattern = f"**/{pattern}" if recursive else pattern
+        dir_count = 0
+        # 显式栈的深度优先遍历：排除目录在进入之前即被剪枝，
+        # DirEntry 复用目录读取得到的类型信息，无需逐项 stat
+        stack = [str(self.project_path)]
+
+        while stack:
+            subdirs = []
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name in exclude_names or (
+                            exclude_matchers and any(match(name) for match in exclude_matchers)
+                        ):
+                            continue
+
+                        if entry.is_dir(follow_symlinks=False):
+                            dir_count += 1
+                            if recursive:
+                                subdirs.append(entry.path)
+                        elif (match_name is None or match_name(name)) and entry.is_file():
+                            files.append(Path(entry.path))
+            except OSError:
+                continue
 
-        for file_path in self.project_path.glob(glob_pattern):
-            if file_path.is_file():
-                # 检查是否在排除目录中
-                if not any(excluded in file_path.parts for excluded in exclude_dirs):
-                    files.append(file_path)
+            # 逆序入栈，保持与 glob 相同的先序遍历顺序
+            stack.extend(reversed(subdirs))
 
-        return files
+        return files, dir_count
 
-    def _count_lines(self, file_path: Path) -> Dict[str, int]:
+    def _count_lines(
+        self,
+        file_path: Path,
+        data: Union[bytes, OSError, None] = None
+    ) -> Dict[str, int]:
         """
         统计文件行数
 
         Args:
             file_path: 文件路径
+            data: 已读取的文件内容或读取时的异常（未提供时读取文件）
 
         Returns:
             Dict[str, int]: 包含总行数、代码行数、注释行数、空行数
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            if data is None:
+                data = read_bytes(file_path)
+            elif isinstance(data, OSError):
+                raise data
 
-            total = len(lines)
-            blank = sum(1 for line in lines if line.strip() == '')
-            comment = sum(1 for line in lines if line.strip().startswith('#'))
-            code = total - blank - comment
+            return _line_stats(data)
+        except Exception as e:
+            with self._result_lock:
+                self.result.add_warning(f"无法读取文件 {file_path}: {str(e)}")
+            return {'total': 0, 'code': 0, 'comment': 0, 'blank': 0}
 
+    def _count_lines_bulk(self, files: Iterable[Path]) -> Dict[Path, Dict[str, int]]:
+        """
+        批量统计文件行数
+
+        文件较多且有多个 CPU 时用进程池并行统计；单核或进程池不可用时，
+        用线程池重叠磁盘 I/O（读取文件的系统调用会释放 GIL）。
+        文件较少时顺序读取，并提前提示内核预读随后的文件。
+
+        Args:
+            files: 文件路径列表
+
+        Returns:
+            Dict[Path, Dict[str, int]]: 按输入顺序排列的文件到行数统计的映射
+        """
+        files = list(files)
+        if len(files) < _BULK_PARALLEL_MIN_FILES:
             return {
-                'total': total,
-                'code': code,
-                'comment': comment,
-                'blank': blank
+                file_path: self._count_lines(file_path, data)
+                for file_path, data in read_many(files)
             }
-        except Exception as e:
-            self.result.add_warning(f"无法读取文件 {file_path}: {str(e)}")
-            return {'total': 0, 'code': 0, 'comment': 0, 'blank': 0}
 
-    def _get_file_extension(self, file_path: Path) -> str:
-        """获取文件扩展名（小写，不含点）"""
-        return file_path.suffix.lower().lstrip('.')
+        cpu_count = os.cpu_count() or 1
+        if cpu_count > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=cpu_count) as executor:
+                    outcomes = list(executor.map(
+                        _count_lines_standalone, map(str, files), chunksize=32
+                    ))
+            except Exception:
+                outcomes = None
+
+            if outcomes is not None:
+                counts = {}
+                for file_path, (line_counts, error) in zip(files, outcomes):
+                    if error is not None:
+                        self.result.add_warning(f"无法读取文件 {file_path}: {error}")
+                        line_counts = {'total': 0, 'code': 0, 'comment': 0, 'blank': 0}
+                    counts[file_path] = line_counts
+                return counts
+
+        max_workers = min(32, cpu_count * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(files, executor.map(self._count_lines, files)))
+
+    def _get_file_extension(self, file_path: Union[Path, str]) -> str:
+        """
+        获取文件扩展名（小写，不含点）
+
+        Args:
+            file_path: 文件路径，或已知的文件名字符串（如 DirEntry.name）
+
+        Returns:
+            str: 扩展名，规则与 Path.suffix 一致（以点开头的文件名无扩展名）
+        """
+        name = file_path if isinstance(file_path, str) else file_path.name
+        index = name.rfind('.')
+        if 0 < index < len(name) - 1:
+            return name[index + 1:].lower()
+        return ''
 
     def _format_size(self, size_bytes: int) -> str:
         """格式化文件大小"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} TB"
+        if size_bytes < 1024:
+            return f"{size_bytes:.2f} B"
+        # 由位长度直接确定单位（每级 2^10），只做一次除法
+        index = min((int(size_bytes).bit_length() - 1) // 10, 4)
+        return f"{size_bytes / (1 << (index * 10)):.2f} {_SIZE_UNITS[index]}"
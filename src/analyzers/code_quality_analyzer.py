@@ -4,17 +4,196 @@
 分析代码复杂度、潜在问题、代码风格等质量指标。
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import ast
+import os
 import re
 
-from .base import BaseAnalyzer, AnalysisResult
+from .base import BaseAnalyzer, AnalysisResult, compile_glob
+from ._ast_cache import AstCache
+from ._records import ComplexFunction, FileIssue
+
+try:
+    import pathspec
+except ImportError:  # 可选依赖，缺失时不按 .gitignore 过滤
+    pathspec = None
+
+HAS_PATHSPEC = pathspec is not None
+
+# 代码风格与复杂度只检查前若干个文件
+_DETAILED_FILE_LIMIT = 20
+
+# 超过该大小的 Python 文件（多为生成代码）不解析
+_MAX_PARSE_BYTES = 1024 * 1024
+
+# 函数定义节点（含 async def）
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# 可能超长的行（超过 100 个字符，末尾空白剥离后再确认）
+_LONG_LINE_RE = re.compile(r'[^\n]{101,}')
+
+# 待解析文件少于该数量时串行处理，避免进程池启动开销
+_PARALLEL_MIN_FILES = 32
+
+# 增加圈复杂度的分支节点与推导式节点，按节点类型一次字典查找即得增量
+_COMPLEXITY_NODES = frozenset((
+    ast.If, ast.IfExp, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler,
+    ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp,
+))
+
+
+def _has_docstring(node: ast.AST) -> bool:
+    """
+    检查函数或类是否有非空文档字符串
+
+    只判断首条语句是否为字符串常量，不像 ast.get_docstring 那样清理缩进；
+    仅含空白的文档字符串交给 ast.get_docstring 判定，保持结果一致。
+    """
+    body = node.body
+    if not body or type(body[0]) is not ast.Expr:
+        return False
+    value = body[0].value
+    if type(value) is not ast.Constant or not isinstance(value.value, str):
+        return False
+    return bool(value.value.strip()) or bool(ast.get_docstring(node))
+
+
+def _walk_tree(tree: ast.AST) -> Tuple[List[Tuple[ast.FunctionDef, int]], int, int]:
+    """
+    单次遍历语法树，收集函数、类与文档字符串信息
+
+    圈复杂度 = 1 + 函数子树（含嵌套定义）中的分支数（含条件表达式与 async for）、
+    布尔运算附加项与推导式（含生成器表达式）数。
+    遍历时为每个外层函数维护一个计数器，子树中的节点累加到所有外层函数上。
+
+    Args:
+        tree: 模块语法树
+
+    Returns:
+        Tuple: ([(函数节点, 圈复杂度)], 类数量, 缺少文档字符串的函数/类数量)，
+        函数按 ast.walk 的广度优先顺序排列
+    """
+    functions = []
+    class_count = 0
+    missing_docstrings = 0
+
+    # (节点, 深度, 外层函数计数器元组)；先序深度优先遍历
+    stack = [(tree, 0, ())]
+    while stack:
+        node, depth, enclosing = stack.pop()
+        node_type = type(node)
+
+        if node_type in _FUNCTION_NODES:
+            counter = [1]
+            functions.append((depth, node, counter))
+            if not _has_docstring(node):
+                missing_docstrings += 1
+            enclosing = enclosing + (counter,)
+        else:
+            if node_type is ast.ClassDef:
+                class_count += 1
+                if not _has_docstring(node):
+                    missing_docstrings += 1
+
+            if enclosing:
+                if node_type in _COMPLEXITY_NODES:
+                    increment = 1
+                elif node_type is ast.BoolOp:
+                    increment = len(node.values) - 1
+                else:
+                    increment = 0
+
+                if increment:
+                    for counter in enclosing:
+                        counter[0] += increment
+
+        children = list(ast.iter_child_nodes(node))
+        depth += 1
+        for child in reversed(children):
+            stack.append((child, depth, enclosing))
+
+    # 同一深度内先序与广度优先顺序一致，按深度稳定排序即得 ast.walk 的顺序
+    functions.sort(key=lambda record: record[0])
+    functions = [(node, counter[0]) for _, node, counter in functions]
+    return functions, class_count, missing_docstrings
+
+
+def _file_facts(data: bytes) -> Dict[str, Any]:
+    """
+    由文件内容计算可缓存的分析事实
+
+    Args:
+        data: 文件内容
+
+    Returns:
+        Dict[str, Any]: error 为 None 或 (类型, 信息)，类型为 read（无法解码）、
+        syntax（语法错误）或 parse（其他解析失败）；functions 为
+        [(函数名, 行号, 长度, 圈复杂度)]，按 ast.walk 顺序排列
+    """
+    facts = {
+        'error': None,
+        'long_lines': 0,
+        'functions': [],
+        'class_count': 0,
+        'missing_docstrings': 0,
+    }
+
+    try:
+        content = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        facts['error'] = ('read', str(e))
+        return facts
+
+    # 与文本模式读取一致的通用换行处理
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+    # 只为候选长行创建字符串，不按行拆分整个文件
+    facts['long_lines'] = sum(
+        1 for match in _LONG_LINE_RE.finditer(content) if len(match.group().rstrip()) > 100
+    )
+
+    try:
+        tree = ast.parse(content)
+    except SyntaxError as e:
+        facts['error'] = ('syntax', str(e))
+        return facts
+    except Exception as e:
+        facts['error'] = ('parse', str(e))
+        return facts
+
+    functions, facts['class_count'], facts['missing_docstrings'] = _walk_tree(tree)
+    facts['functions'] = [
+        (node.name, node.lineno, node.end_lineno - node.lineno, func_complexity)
+        for node, func_complexity in functions
+    ]
+    return facts
 
 
 class CodeQualityAnalyzer(BaseAnalyzer):
     """代码质量分析器"""
 
+    def __init__(
+        self,
+        project_path: Path,
+        use_cache: bool = True,
+        file_index: Optional[List[Path]] = None,
+        dir_count: Optional[int] = None
+    ):
+        """
+        初始化代码质量分析器
+
+        Args:
+            project_path: 项目根目录路径
+            use_cache: 是否读写 AstCache 磁盘缓存（关闭时每个文件都重新解析）
+            file_index: 已扫描的项目文件列表（未提供时扫描一次）
+            dir_count: 与 file_index 同一次扫描得到的目录数
+        """
+        super().__init__(project_path, file_index=file_index, dir_count=dir_count)
+        self.use_cache = use_cache
+
     def analyze(self) -> AnalysisResult:
         """
         执行代码质量分析
@@ -23,16 +202,14 @@ class CodeQualityAnalyzer(BaseAnalyzer):
             AnalysisResult: 包含代码质量信息的分析结果
         """
         try:
-            # 分析 Python 代码
-            python_files = self._scan_files(pattern="*.py")
+            # 单遍完成 Python 代码统计、代码风格检查与复杂度分析
+            python_files = self._select_python_files(self._scan_files(pattern="*.py"))
+            python_analysis, style_issues, complexity = self._collect(python_files)
             if python_files:
-                self.result.data['python_analysis'] = self._analyze_python_code(python_files)
-
-            # 代码风格检查
-            self.result.data['style_issues'] = self._check_code_style(python_files)
+                self.result.data['python_analysis'] = python_analysis
 
-            # 复杂度分析
-            self.result.data['complexity_analysis'] = self._analyze_complexity(python_files)
+            self.result.data['style_issues'] = style_issues
+            self.result.data['complexity_analysis'] = complexity
 
             # 最佳实践检查
             self.result.data['best_practices'] = self._check_best_practices()
@@ -42,61 +219,71 @@ class CodeQualityAnalyzer(BaseAnalyzer):
 
         return self.result
 
-    def _analyze_python_code(self, python_files: List[Path]) -> Dict[str, Any]:
-        """分析 Python 代码"""
-        analysis = {
-            'total_files': len(python_files),
-            'total_functions': 0,
-            'total_classes': 0,
-            'average_function_length': 0,
-            'files_with_issues': [],
-        }
+    def _select_python_files(self, python_files: List[Path]) -> List[Path]:
+        """
+        过滤 .gitignore 忽略的文件与过大的文件
 
-        total_function_lines = 0
+        .gitignore 过滤需要安装 pathspec；过大的文件跳过并记录警告。
 
-        for file_path in python_files:
+        Args:
+            python_files: 扫描得到的 Python 文件列表
+
+        Returns:
+            List[Path]: 需要分析的 Python 文件列表
+        """
+        spec = None
+        gitignore = self.project_path / '.gitignore'
+        if pathspec is not None and gitignore.is_file():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                tree = ast.parse(content)
-
-                # 统计函数和类
-                functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-                classes = [node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-
-                analysis['total_functions'] += len(functions)
-                analysis['total_classes'] += len(classes)
-
-                # 计算函数长度
-                for func in functions:
-                    if hasattr(func, 'end_lineno') and hasattr(func, 'lineno'):
-                        func_length = func.end_lineno - func.lineno
-                        total_function_lines += func_length
-
-                        # 检查过长的函数
-                        if func_length > 50:
-                            analysis['files_with_issues'].append({
-                                'file': str(file_path.relative_to(self.project_path)),
-                                'issue': f"函数 '{func.name}' 过长 ({func_length} 行)",
-                                'line': func.lineno
-                            })
-
-            except SyntaxError as e:
-                self.result.add_warning(f"语法错误 {file_path}: {str(e)}")
+                with open(gitignore, 'r', encoding='utf-8') as f:
+                    spec = pathspec.PathSpec.from_lines('gitwildmatch', f)
             except Exception as e:
-                self.result.add_warning(f"无法分析 {file_path}: {str(e)}")
+                self.result.add_warning(f"无法解析 .gitignore: {str(e)}")
 
-        # 计算平均函数长度
-        if analysis['total_functions'] > 0:
-            analysis['average_function_length'] = round(
-                total_function_lines / analysis['total_functions'], 2
-            )
+        selected = []
+        for file_path in python_files:
+            if spec is not None and spec.match_file(self._relative_path(file_path)):
+                continue
 
-        return analysis
+            try:
+                size = file_path.stat().st_size
+            except OSError:
+                # 无法访问的文件交给后续分析记录警告
+                size = 0
+
+            if size > _MAX_PARSE_BYTES:
+                self.result.add_warning(
+                    f"跳过过大的文件 {file_path} ({self._format_size(size)})"
+                )
+                continue
+            selected.append(file_path)
+
+        return selected
+
+    def _collect(
+        self,
+        python_files: List[Path]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        单遍收集 Python 代码统计、代码风格与复杂度
+
+        每个文件只读取、解析一次，并只遍历一次语法树；
+        未变化文件的分析事实从 AstCache 读取，不再解析，
+        其余文件较多时在进程池中并行解析。
+
+        Args:
+            python_files: Python 文件列表
 
-    def _check_code_style(self, python_files: List[Path]) -> Dict[str, Any]:
-        """检查代码风格"""
+        Returns:
+            Tuple: (Python 代码分析, 代码风格问题, 复杂度分析)
+        """
+        analysis = {
+            'total_files': len(python_files),
+            'total_functions': 0,
+            'total_classes': 0,
+            'average_function_length': 0,
+            'files_with_issues': [],
+        }
         issues = {
             'total_issues': 0,
             'by_type': {
@@ -106,104 +293,150 @@ class CodeQualityAnalyzer(BaseAnalyzer):
             },
             'details': []
         }
-
-        for file_path in python_files[:20]:  # 限制检查文件数
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-
-                for i, line in enumerate(lines, 1):
-                    # 检查行长度
-                    if len(line.rstrip()) > 100:
-                        issues['by_type']['long_lines'] += 1
-                        issues['total_issues'] += 1
-
-                # 检查是否有文档字符串
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                try:
-                    tree = ast.parse(content)
-                    for node in ast.walk(tree):
-                        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                            if not ast.get_docstring(node):
-                                issues['by_type']['missing_docstrings'] += 1
-                                issues['total_issues'] += 1
-                except:
-                    pass
-
-            except Exception as e:
-                self.result.add_warning(f"无法检查 {file_path}: {str(e)}")
-
-        return issues
-
-    def _analyze_complexity(self, python_files: List[Path]) -> Dict[str, Any]:
-        """分析代码复杂度"""
         complexity = {
             'high_complexity_functions': [],
             'average_complexity': 0,
             'max_complexity': 0,
         }
 
+        total_function_lines = 0
         total_complexity = 0
-        function_count = 0
 
-        for file_path in python_files[:20]:  # 限制分析文件数
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                tree = ast.parse(content)
-
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        func_complexity = self._calculate_cyclomatic_complexity(node)
-                        total_complexity += func_complexity
-                        function_count += 1
+        # 聚合时使用紧凑的记录对象，输出时再转换为字典
+        long_functions = []
+        complex_functions = []
+        function_count = 0
 
-                        if func_complexity > complexity['max_complexity']:
-                            complexity['max_complexity'] = func_complexity
+        # 三类警告分别收集，保持与逐项分析时相同的输出顺序
+        analysis_warnings = []
+        style_warnings = []
+        complexity_warnings = []
 
-                        if func_complexity > 10:
-                            complexity['high_complexity_functions'].append({
-                                'file': str(file_path.relative_to(self.project_path)),
-                                'function': node.name,
-                                'complexity': func_complexity,
-                                'line': node.lineno
-                            })
+        cache = AstCache(self.project_path, enabled=self.use_cache)
+        try:
+            facts_list = []
+            misses = []
+            for index, file_path in enumerate(python_files):
+                try:
+                    facts, pending = cache.lookup(file_path)
+                except Exception as e:
+                    facts, pending = {'error': ('read', str(e))}, None
+                facts_list.append(facts)
+                if pending is not None:
+                    misses.append((index, pending))
+
+            computed = self._compute_facts([pending[0] for _, pending in misses])
+            for (index, pending), facts in zip(misses, computed):
+                facts_list[index] = facts
+                cache.store(python_files[index], pending, facts)
+        finally:
+            cache.close()
+
+        for index, (file_path, facts) in enumerate(zip(python_files, facts_list)):
+            # 代码风格与复杂度只检查前 _DETAILED_FILE_LIMIT 个文件
+            detailed = index < _DETAILED_FILE_LIMIT
+            error = facts['error']
+
+            if error is not None and error[0] == 'read':
+                analysis_warnings.append(f"无法分析 {file_path}: {error[1]}")
+                if detailed:
+                    style_warnings.append(f"无法检查 {file_path}: {error[1]}")
+                    complexity_warnings.append(f"无法分析复杂度 {file_path}: {error[1]}")
+                continue
+
+            if detailed:
+                # 检查行长度
+                issues['by_type']['long_lines'] += facts['long_lines']
+                issues['total_issues'] += facts['long_lines']
+
+            if error is not None:
+                if error[0] == 'syntax':
+                    analysis_warnings.append(f"语法错误 {file_path}: {error[1]}")
+                else:
+                    analysis_warnings.append(f"无法分析 {file_path}: {error[1]}")
+                if detailed:
+                    complexity_warnings.append(f"无法分析复杂度 {file_path}: {error[1]}")
+                continue
+
+            functions = facts['functions']
+            relative_path = None
+
+            analysis['total_functions'] += len(functions)
+            analysis['total_classes'] += facts['class_count']
+
+            if detailed:
+                issues['by_type']['missing_docstrings'] += facts['missing_docstrings']
+                issues['total_issues'] += facts['missing_docstrings']
+
+            for name, lineno, func_length, func_complexity in functions:
+                # 累计函数长度
+                total_function_lines += func_length
+
+                # 检查过长的函数
+                if func_length > 50:
+                    if relative_path is None:
+                        relative_path = self._relative_path(file_path)
+                    long_functions.append(FileIssue(
+                        relative_path, f"函数 '{name}' 过长 ({func_length} 行)", lineno
+                    ))
+
+                if not detailed:
+                    continue
+
+                total_complexity += func_complexity
+                function_count += 1
+
+                if func_complexity > complexity['max_complexity']:
+                    complexity['max_complexity'] = func_complexity
+
+                if func_complexity > 10:
+                    if relative_path is None:
+                        relative_path = self._relative_path(file_path)
+                    complex_functions.append(
+                        ComplexFunction(relative_path, name, func_complexity, lineno)
+                    )
+
+        analysis['files_with_issues'] = [record.to_dict() for record in long_functions]
+        complexity['high_complexity_functions'] = [
+            record.to_dict() for record in complex_functions
+        ]
+
+        for warning in analysis_warnings + style_warnings + complexity_warnings:
+            self.result.add_warning(warning)
 
-            except Exception as e:
-                self.result.add_warning(f"无法分析复杂度 {file_path}: {str(e)}")
+        # 计算平均函数长度
+        if analysis['total_functions'] > 0:
+            analysis['average_function_length'] = round(
+                total_function_lines / analysis['total_functions'], 2
+            )
 
         if function_count > 0:
             complexity['average_complexity'] = round(total_complexity / function_count, 2)
 
-        return complexity
+        return analysis, issues, complexity
 
-    def _calculate_cyclomatic_complexity(self, node: ast.FunctionDef) -> int:
+    @staticmethod
+    def _compute_facts(contents: List[bytes]) -> List[Dict[str, Any]]:
         """
-        计算圈复杂度
+        解析缓存未命中的文件内容
+
+        ast.parse 受 GIL 限制，文件较多时使用进程池并行；
+        进程池不可用时回退到串行处理。
 
         Args:
-            node: AST 函数节点
+            contents: 文件内容列表
 
         Returns:
-            int: 圈复杂度值
+            List[Dict[str, Any]]: 与输入顺序一致的分析事实
         """
-        complexity = 1  # 基础复杂度
-
-        for child in ast.walk(node):
-            # 条件语句增加复杂度
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
-                complexity += 1
-            # 布尔运算符增加复杂度
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
-            # 列表推导式增加复杂度
-            elif isinstance(child, (ast.ListComp, ast.DictComp, ast.SetComp)):
-                complexity += 1
-
-        return complexity
+        workers = os.cpu_count() or 1
+        if workers > 1 and len(contents) >= _PARALLEL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    return list(executor.map(_file_facts, contents, chunksize=16))
+            except Exception:
+                pass
+        return [_file_facts(data) for data in contents]
 
     def _check_best_practices(self) -> Dict[str, Any]:
         """检查最佳实践"""
@@ -216,36 +449,41 @@ class CodeQualityAnalyzer(BaseAnalyzer):
             'recommendations': []
         }
 
+        # 一次读取根目录，以下检查均在内存中完成
+        try:
+            with os.scandir(self.project_path) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+
         # 检查测试目录
-        if (self.project_path / 'tests').exists() or \
-           (self.project_path / 'test').exists():
+        if 'tests' in names or 'test' in names:
             practices['has_tests'] = True
         else:
             practices['recommendations'].append("建议添加测试目录和测试用例")
 
         # 检查 README
-        readme_files = list(self.project_path.glob('README*'))
-        if readme_files:
+        match_readme = compile_glob('README*')
+        if any(match_readme(name) for name in names):
             practices['has_readme'] = True
         else:
             practices['recommendations'].append("建议添加 README 文档")
 
         # 检查依赖文件
-        if (self.project_path / 'requirements.txt').exists() or \
-           (self.project_path / 'pyproject.toml').exists():
+        if 'requirements.txt' in names or 'pyproject.toml' in names:
             practices['has_requirements'] = True
         else:
             practices['recommendations'].append("建议添加依赖管理文件")
 
         # 检查 .gitignore
-        if (self.project_path / '.gitignore').exists():
+        if '.gitignore' in names:
             practices['has_gitignore'] = True
         else:
             practices['recommendations'].append("建议添加 .gitignore 文件")
 
         # 检查 LICENSE
-        license_files = list(self.project_path.glob('LICENSE*'))
-        if license_files:
+        match_license = compile_glob('LICENSE*')
+        if any(match_license(name) for name in names):
             practices['has_license'] = True
         else:
             practices['recommendations'].append("建议添加开源许可证")
@@ -5,12 +5,42 @@
 """
 
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
 import re
 
 from .base import BaseAnalyzer, AnalysisResult
 
+# Python 3.11+ 使用标准库 tomllib，旧版本回退到 tomli
+try:
+    import tomllib as _toml
+except ImportError:
+    try:
+        import tomli as _toml
+    except ImportError:
+        _toml = None
+
+HAS_TOML = _toml is not None
+
+# 依赖声明开头的包名
+_PACKAGE_NAME_RE = re.compile(r'[a-zA-Z0-9_-]+')
+
+
+def _split_requirement(line: str) -> Optional[Tuple[str, str]]:
+    """
+    拆分依赖声明为包名与版本约束
+
+    Args:
+        line: 依赖声明，如 "requests>=2.0"
+
+    Returns:
+        Optional[Tuple[str, str]]: (包名, 版本约束)，无法识别包名时返回 None
+    """
+    match = _PACKAGE_NAME_RE.match(line)
+    if match is None:
+        return None
+    return match.group(), line[match.end():].strip()
+
 
 class DependencyAnalyzer(BaseAnalyzer):
     """依赖关系分析器"""
@@ -86,15 +116,13 @@ class DependencyAnalyzer(BaseAnalyzer):
                         continue
 
                     # 解析包名和版本
-                    match = re.match(r'^([a-zA-Z0-9_-]+)([>=<~!]+)?(.+)?', line)
-                    if match:
-                        name = match.group(1)
-                        operator = match.group(2) or ''
-                        version = match.group(3) or ''
+                    parsed = _split_requirement(line)
+                    if parsed:
+                        name, version_spec = parsed
 
                         packages.append({
                             'name': name,
-                            'version_spec': f"{operator}{version}".strip(),
+                            'version_spec': version_spec,
                             'raw': line
                         })
 
@@ -107,25 +135,25 @@ class DependencyAnalyzer(BaseAnalyzer):
         """解析 pyproject.toml"""
         packages = []
 
-        try:
-            import tomli
+        if _toml is None:
+            self.result.add_warning("需要安装 tomli 来解析 pyproject.toml")
+            return packages
 
+        try:
             with open(self.project_path / 'pyproject.toml', 'rb') as f:
-                data = tomli.load(f)
+                data = _toml.load(f)
 
             # 提取依赖
             if 'project' in data and 'dependencies' in data['project']:
                 for dep in data['project']['dependencies']:
-                    match = re.match(r'^([a-zA-Z0-9_-]+)([>=<~!]+)?(.+)?', dep)
-                    if match:
+                    parsed = _split_requirement(dep)
+                    if parsed:
                         packages.append({
-                            'name': match.group(1),
-                            'version_spec': f"{match.group(2) or ''}{match.group(3) or ''}".strip(),
+                            'name': parsed[0],
+                            'version_spec': parsed[1],
                             'raw': dep
                         })
 
-        except ImportError:
-            self.result.add_warning("需要安装 tomli 来解析 pyproject.toml")
         except Exception as e:
             self.result.add_warning(f"无法解析 pyproject.toml: {str(e)}")
 
@@ -4,19 +4,52 @@
 收集和汇总各种项目指标。
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+import hashlib
+import json
+import os
 
-from .base import BaseAnalyzer, AnalysisResult
+from ._io import CACHE_VERSION, write_atomic
+from .base import BaseAnalyzer, AnalysisResult, compile_glob
 from .project_analyzer import ProjectAnalyzer
-from .code_quality_analyzer import CodeQualityAnalyzer
-from .dependency_analyzer import DependencyAnalyzer
+from .code_quality_analyzer import CodeQualityAnalyzer, HAS_PATHSPEC
+from .dependency_analyzer import DependencyAnalyzer, HAS_TOML
+
+
+# 各子分析器结果的增量缓存
+_RESULTS_CACHE_FILE = Path('.vcu_qa_cache') / 'results.json'
+
+# DependencyAnalyzer 读取的依赖清单
+_MANIFEST_FILES = ('requirements.txt', 'pyproject.toml', 'package.json', 'setup.py')
 
 
 class MetricsCollector(BaseAnalyzer):
     """指标收集器"""
 
+    def __init__(
+        self,
+        project_path: Path,
+        use_cache: bool = True,
+        file_index: Optional[List[Path]] = None,
+        dir_count: Optional[int] = None
+    ):
+        """
+        初始化指标收集器
+
+        Args:
+            project_path: 项目根目录路径
+            use_cache: 是否使用磁盘缓存（子分析器结果与逐文件的 AST 分析事实）
+            file_index: 已扫描的项目文件列表（未提供时扫描一次）
+            dir_count: 与 file_index 同一次扫描得到的目录数
+        """
+        super().__init__(project_path, file_index=file_index, dir_count=dir_count)
+        self.use_cache = use_cache
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     def analyze(self) -> AnalysisResult:
         """
         收集所有指标
@@ -25,10 +58,51 @@ class MetricsCollector(BaseAnalyzer):
             AnalysisResult: 包含所有指标的分析结果
         """
         try:
-            # 运行所有分析器
-            project_result = ProjectAnalyzer(self.project_path).analyze()
-            quality_result = CodeQualityAnalyzer(self.project_path).analyze()
-            dependency_result = DependencyAnalyzer(self.project_path).analyze()
+            # 运行所有分析器（互不依赖）；输入未变化的分析器直接复用上次的结果；
+            # 文件系统只扫描一次，扫描结果注入所有子分析器
+            file_index = self._scan_files()
+            dir_count = self._count_directories()
+            analyzer_classes = (ProjectAnalyzer, CodeQualityAnalyzer, DependencyAnalyzer)
+            signatures = self._compute_signatures() if self.use_cache else None
+            cached = self._load_cached_results(signatures) if signatures else {}
+            options = {
+                CodeQualityAnalyzer: {'use_cache': self.use_cache},
+            }
+            analyzers = {
+                cls.__name__: cls(
+                    self.project_path,
+                    file_index=file_index,
+                    dir_count=dir_count,
+                    **options.get(cls, {})
+                )
+                for cls in analyzer_classes
+                if cls.__name__ not in cached
+            }
+
+            if (os.cpu_count() or 1) > 1:
+                # 多核时子分析器内部会用进程池并行解析与统计：在主线程依次运行，
+                # 避免在多线程进程中 fork，也避免多个进程池同时争抢全部 CPU
+                results = {name: analyzer.analyze() for name, analyzer in analyzers.items()}
+            else:
+                # 单核时子分析器不会创建进程池，并发执行以重叠 I/O 与解析
+                with ThreadPoolExecutor(max_workers=len(analyzer_classes)) as executor:
+                    futures = {
+                        name: executor.submit(analyzer.analyze)
+                        for name, analyzer in analyzers.items()
+                    }
+                    results = {name: future.result() for name, future in futures.items()}
+
+            if self.use_cache:
+                self._cache_hits += len(cached)
+                self._cache_misses += len(results)
+
+            if signatures and results:
+                self._store_cached_results(signatures, cached, results)
+            results.update(cached)
+
+            project_result, quality_result, dependency_result = [
+                results[cls.__name__] for cls in analyzer_classes
+            ]
 
             # 汇总结果
             self.result.data['project'] = project_result.data
@@ -55,6 +129,151 @@ class MetricsCollector(BaseAnalyzer):
 
         return self.result
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取子分析器结果缓存的命中统计
+
+        每次 analyze 中，签名匹配而直接复用的子分析器计为一次命中，
+        重新运行的计为一次未命中；未启用缓存时不计数。
+
+        Returns:
+            Dict[str, Any]: 命中次数、未命中次数与命中率
+        """
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'hit_rate': round(self._cache_hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _compute_signatures(self) -> Optional[Dict[str, str]]:
+        """
+        计算各子分析器输入的签名
+
+        - ProjectAnalyzer: 全部文件的路径、修改时间与大小，以及 Git 状态
+        - CodeQualityAnalyzer: Python 文件的路径、修改时间与大小、根目录条目，以及 .gitignore 内容
+        - DependencyAnalyzer: 依赖清单文件的内容
+
+        Returns:
+            Optional[Dict[str, str]]: 分析器类名到签名的映射，计算失败时返回 None
+        """
+        try:
+            project_digest = hashlib.blake2b(digest_size=16)
+            quality_digest = hashlib.blake2b(digest_size=16)
+            dependency_digest = hashlib.blake2b(digest_size=16)
+
+            root = str(self.project_path.absolute())
+            project_digest.update(root.encode('utf-8', 'surrogateescape'))
+            is_python_file = compile_glob('*.py')
+            for file_path in self._scan_files():
+                stat = file_path.stat()
+                entry = f"{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode(
+                    'utf-8', 'surrogateescape'
+                )
+                project_digest.update(entry)
+                if is_python_file(file_path.name):
+                    quality_digest.update(entry)
+            # 空目录的增删不改变文件列表，但会改变目录数
+            project_digest.update(f"{self._count_directories()}\n".encode('utf-8'))
+            project_digest.update(self._git_state())
+
+            # 最佳实践检查依赖根目录下的 README、LICENSE、tests 等条目
+            # （缓存目录本身不计入，否则首次写入缓存就会使签名失效）
+            root_entries = '\0'.join(sorted(
+                name for name in os.listdir(self.project_path)
+                if name != _RESULTS_CACHE_FILE.parts[0]
+            ))
+            quality_digest.update(root_entries.encode('utf-8', 'surrogateescape'))
+
+            # 安装 pathspec 时按 .gitignore 过滤参与分析的 Python 文件
+            quality_digest.update(b'pathspec\0' if HAS_PATHSPEC else b'\0')
+            gitignore = self.project_path / '.gitignore'
+            if gitignore.is_file():
+                quality_digest.update(gitignore.read_bytes())
+
+            for name in _MANIFEST_FILES:
+                manifest = self.project_path / name
+                content = manifest.read_bytes() if manifest.is_file() else b''
+                dependency_digest.update(f"{name}\0{len(content)}\0".encode('utf-8'))
+                dependency_digest.update(content)
+            # 能否解析 TOML 会影响 pyproject.toml 的解析结果
+            dependency_digest.update(b'toml' if HAS_TOML else b'')
+
+            return {
+                ProjectAnalyzer.__name__: project_digest.hexdigest(),
+                CodeQualityAnalyzer.__name__: quality_digest.hexdigest(),
+                DependencyAnalyzer.__name__: dependency_digest.hexdigest(),
+            }
+        except Exception:
+            return None
+
+    def _git_state(self) -> bytes:
+        """读取 HEAD 及其指向的引用，提交或切换分支后内容随之变化"""
+        git_dir = self.project_path / '.git'
+        head_file = git_dir / 'HEAD'
+        if not head_file.is_file():
+            return b''
+
+        head = head_file.read_bytes()
+        state = [head]
+        if head.startswith(b'ref: '):
+            ref_file = git_dir / head[5:].strip().decode('utf-8', 'surrogateescape')
+            if ref_file.is_file():
+                state.append(ref_file.read_bytes())
+            elif (git_dir / 'packed-refs').is_file():
+                state.append((git_dir / 'packed-refs').read_bytes())
+        return b'\0'.join(state)
+
+    def _load_cached_results(self, signatures: Dict[str, str]) -> Dict[str, AnalysisResult]:
+        """读取签名仍然匹配的子分析器结果，读取失败时返回空字典"""
+        try:
+            with open(self.project_path / _RESULTS_CACHE_FILE, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except Exception:
+            return {}
+
+        if payload.get('version') != CACHE_VERSION:
+            return {}
+
+        cached = {}
+        for name, entry in payload.get('results', {}).items():
+            if signatures.get(name) != entry.get('key'):
+                continue
+            cached[name] = AnalysisResult(
+                analyzer_name=name,
+                data=entry['data'],
+                errors=entry['errors'],
+                warnings=entry['warnings'],
+            )
+        return cached
+
+    def _store_cached_results(
+        self,
+        signatures: Dict[str, str],
+        cached: Dict[str, AnalysisResult],
+        results: Dict[str, AnalysisResult]
+    ) -> None:
+        """写入子分析器结果缓存（原子替换，失败时静默忽略；出错的结果不写入）"""
+        entries = {}
+        for name, result in list(cached.items()) + list(results.items()):
+            if result.errors:
+                continue
+            entries[name] = {
+                'key': signatures[name],
+                'data': result.data,
+                'errors': result.errors,
+                'warnings': result.warnings,
+            }
+
+        payload = {'version': CACHE_VERSION, 'results': entries}
+        try:
+            write_atomic(
+                self.project_path / _RESULTS_CACHE_FILE,
+                json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            )
+        except Exception:
+            pass
+
     def _calculate_overall_score(self) -> Dict[str, Any]:
         """计算综合评分"""
         score = {
@@ -6,11 +6,30 @@
 
 from pathlib import Path
 from typing import Dict, Any, List
-from collections import defaultdict
+from collections import Counter
 import json
+import os
 
 from .base import BaseAnalyzer, AnalysisResult
 
+# 目录树的最大行数
+_TREE_MAX_LINES = 100
+
+# 分析工具自身的缓存目录，不计入项目结构
+_CACHE_DIR = '.vcu_qa_cache'
+
+# 统计代码行数的文件扩展名
+_CODE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.h',
+})
+
+# 目录树中不展示的目录
+_TREE_EXCLUDE_DIRS = frozenset({
+    '__pycache__', '.git', '.venv', 'venv',
+    'node_modules', '.pytest_cache', '.mypy_cache',
+    'dist', 'build', _CACHE_DIR,
+})
+
 
 class ProjectAnalyzer(BaseAnalyzer):
     """项目结构分析器"""
@@ -79,32 +98,37 @@ class ProjectAnalyzer(BaseAnalyzer):
         try:
             import subprocess
 
-            # 获取当前分支
+            # 一次调用同时获取引用名（含当前分支）与最后一次提交
             result = subprocess.run(
-                ['git', 'branch', '--show-current'],
+                ['git', 'log', '-1', '--format=%D%x00%H%x00%an%x00%ad%x00%s'],
                 cwd=self.project_path,
                 capture_output=True,
                 text=True
             )
-            if result.returncode == 0:
-                git_info['current_branch'] = result.stdout.strip()
-
-            # 获取最后一次提交
-            result = subprocess.run(
-                ['git', 'log', '-1', '--format=%H|%an|%ad|%s'],
-                cwd=self.project_path,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                parts = result.stdout.strip().split('|')
-                if len(parts) == 4:
-                    git_info['last_commit'] = {
-                        'hash': parts[0][:8],
-                        'author': parts[1],
-                        'date': parts[2],
-                        'message': parts[3]
-                    }
+            parts = result.stdout.strip('\n').split('\0')
+            if result.returncode == 0 and len(parts) == 5:
+                ref_names, commit_hash, author, date, message = parts
+                git_info['current_branch'] = ''
+                for ref_name in ref_names.split(', '):
+                    if ref_name.startswith('HEAD -> '):
+                        git_info['current_branch'] = ref_name[len('HEAD -> '):]
+                        break
+                git_info['last_commit'] = {
+                    'hash': commit_hash[:8],
+                    'author': author,
+                    'date': date,
+                    'message': message
+                }
+            else:
+                # 尚无提交时只能获取当前分支
+                result = subprocess.run(
+                    ['git', 'branch', '--show-current'],
+                    cwd=self.project_path,
+                    capture_output=True,
+                    text=True
+                )
+                if result.returncode == 0:
+                    git_info['current_branch'] = result.stdout.strip()
         except Exception as e:
             self.result.add_warning(f"无法获取 Git 信息: {str(e)}")
 
@@ -114,19 +138,24 @@ class ProjectAnalyzer(BaseAnalyzer):
         """检测项目类型"""
         project_types = []
 
+        # 一次读取根目录，以下检查均在内存中完成
+        try:
+            with os.scandir(self.project_path) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+
         # Python 项目
-        if (self.project_path / 'setup.py').exists() or \
-           (self.project_path / 'pyproject.toml').exists() or \
-           (self.project_path / 'requirements.txt').exists():
+        if 'setup.py' in names or 'pyproject.toml' in names or 'requirements.txt' in names:
             project_types.append('Python')
 
         # Node.js 项目
-        if (self.project_path / 'package.json').exists():
+        if 'package.json' in names:
             project_types.append('Node.js')
 
         # Markdown 文档项目
-        md_files = list(self.project_path.glob('*.md'))
-        if len(md_files) > 3:
+        md_count = sum(1 for name in names if name.endswith('.md'))
+        if md_count > 3:
             project_types.append('Documentation')
 
         return project_types if project_types else ['Unknown']
@@ -137,65 +166,58 @@ class ProjectAnalyzer(BaseAnalyzer):
 
         return {
             'total_files': len(all_files),
-            'total_directories': len(list(self.project_path.rglob('*'))),
-            'file_list': [str(f.relative_to(self.project_path)) for f in all_files[:100]],
+            'total_directories': self._count_directories(),
+            'file_list': [self._relative_path(f) for f in all_files[:100]],
         }
 
     def _collect_code_statistics(self) -> Dict[str, Any]:
         """收集代码统计信息"""
-        stats = {
-            'total_lines': 0,
-            'code_lines': 0,
-            'comment_lines': 0,
-            'blank_lines': 0,
-            'by_extension': defaultdict(lambda: {
-                'files': 0,
-                'total_lines': 0,
-                'code_lines': 0
-            })
-        }
+        total_lines = code_lines = comment_lines = blank_lines = 0
+        # 扩展名 -> [文件数, 总行数, 代码行数]
+        by_extension: Dict[str, List[int]] = {}
 
         # 只统计代码文件
-        code_extensions = ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.h']
-        code_files = [f for f in self._scan_files() if f.suffix in code_extensions]
-
-        for file_path in code_files:
-            line_counts = self._count_lines(file_path)
-            ext = self._get_file_extension(file_path)
+        code_files = [f for f in self._scan_files() if f.suffix in _CODE_EXTENSIONS]
+
+        get_extension = self._get_file_extension
+        for file_path, line_counts in self._count_lines_bulk(code_files).items():
+            total = line_counts['total']
+            code = line_counts['code']
+
+            total_lines += total
+            code_lines += code
+            comment_lines += line_counts['comment']
+            blank_lines += line_counts['blank']
+
+            ext = get_extension(file_path.name)
+            bucket = by_extension.get(ext)
+            if bucket is None:
+                bucket = by_extension[ext] = [0, 0, 0]
+            bucket[0] += 1
+            bucket[1] += total
+            bucket[2] += code
 
-            stats['total_lines'] += line_counts['total']
-            stats['code_lines'] += line_counts['code']
-            stats['comment_lines'] += line_counts['comment']
-            stats['blank_lines'] += line_counts['blank']
-
-            stats['by_extension'][ext]['files'] += 1
-            stats['by_extension'][ext]['total_lines'] += line_counts['total']
-            stats['by_extension'][ext]['code_lines'] += line_counts['code']
-
-        # 转换 defaultdict 为普通 dict
-        stats['by_extension'] = dict(stats['by_extension'])
-
-        return stats
+        return {
+            'total_lines': total_lines,
+            'code_lines': code_lines,
+            'comment_lines': comment_lines,
+            'blank_lines': blank_lines,
+            'by_extension': {
+                ext: {'files': files, 'total_lines': total, 'code_lines': code}
+                for ext, (files, total, code) in by_extension.items()
+            },
+        }
 
     def _analyze_file_types(self) -> Dict[str, int]:
         """分析文件类型分布"""
-        type_counts = defaultdict(int)
-
-        for file_path in self._scan_files():
-            ext = self._get_file_extension(file_path)
-            if ext:
-                type_counts[ext] += 1
-            else:
-                type_counts['no_extension'] += 1
-
-        # 按数量排序
-        sorted_types = dict(sorted(
-            type_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        ))
+        get_extension = self._get_file_extension
+        type_counts = Counter(
+            get_extension(file_path.name) or 'no_extension'
+            for file_path in self._scan_files()
+        )
 
-        return sorted_types
+        # 按数量排序（数量相同时保持首次出现的顺序）
+        return dict(type_counts.most_common())
 
     def _generate_directory_tree(self, max_depth: int = 3) -> List[str]:
         """
@@ -207,38 +229,38 @@ class ProjectAnalyzer(BaseAnalyzer):
         Returns:
             List[str]: 目录树的每一行
         """
-        tree_lines = []
+        tree_lines = [self.project_path.name]
+        if self.project_path.name in _TREE_EXCLUDE_DIRS:
+            return tree_lines
 
-        def add_tree_line(path: Path, prefix: str = "", depth: int = 0):
+        def add_children(dir_path: str, prefix: str, depth: int):
+            # 子项超出最大深度时无需读取目录
             if depth > max_depth:
                 return
 
-            # 排除的目录
-            exclude_dirs = {
-                '__pycache__', '.git', '.venv', 'venv',
-                'node_modules', '.pytest_cache', '.mypy_cache',
-                'dist', 'build'
-            }
-
-            if path.name in exclude_dirs:
+            try:
+                with os.scandir(dir_path) as entries:
+                    # DirEntry 缓存了类型信息，排序时无需逐项 stat
+                    children = sorted(
+                        (not entry.is_dir(), entry.name, entry.path) for entry in entries
+                    )
+            except PermissionError:
                 return
 
-            # 添加当前项
-            if depth > 0:
-                tree_lines.append(f"{prefix}├── {path.name}")
-
-            # 如果是目录，递归处理子项
-            if path.is_dir():
-                try:
-                    children = sorted(path.iterdir(), key=lambda x: (not x.is_dir(), x.name))
-                    for i, child in enumerate(children):
-                        is_last = i == len(children) - 1
-                        new_prefix = prefix + ("    " if is_last else "│   ")
-                        add_tree_line(child, new_prefix, depth + 1)
-                except PermissionError:
-                    pass
-
-        tree_lines.append(self.project_path.name)
-        add_tree_line(self.project_path)
-
-        return tree_lines[:100]  # 限制行数
+            last_index = len(children) - 1
+            for i, (is_file, name, path) in enumerate(children):
+                # 达到行数上限后不再遍历
+                if len(tree_lines) >= _TREE_MAX_LINES:
+                    return
+                if name in _TREE_EXCLUDE_DIRS:
+                    continue
+
+                child_prefix = prefix + ("    " if i == last_index else "│   ")
+                tree_lines.append(f"{child_prefix}├── {name}")
+                if not is_file:
+                    add_children(path, child_prefix, depth + 1)
+
+        if self.project_path.is_dir():
+            add_children(str(self.project_path), "", 1)
+
+        return tree_lines[:_TREE_MAX_LINES]
@@ -8,30 +8,139 @@
 
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import List, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+from typing import List, Tuple, Optional, Type
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+)
 import time
 
 from src.core.converter import HTMLConverter
 from src.utils.file_scanner import FileScanner
 
+# 文件数少于该值时进程启动开销大于收益，使用线程池
+_PROCESS_MIN_FILES = 8
+
+# 子进程内复用的转换器（每个进程惰性创建一次）
+_worker_converter: Optional[HTMLConverter] = None
+
+
+def _convert_file(
+    converter: HTMLConverter,
+    source: Path,
+    output: Path,
+    theme: str,
+    embed_images: bool,
+    process_mermaid: bool
+) -> dict:
+    """
+    使用给定的转换器处理单个文件
+
+    Args:
+        converter: HTML 转换器
+        source: 源文件
+        output: 输出文件
+        theme: 主题
+        embed_images: 是否嵌入图片
+        process_mermaid: 是否处理Mermaid
+
+    Returns:
+        处理结果
+    """
+    start_time = time.perf_counter()
+
+    try:
+        result = converter.convert(
+            source_path=source,
+            output_path=output,
+            theme=theme,
+            embed_images=embed_images,
+            process_mermaid=process_mermaid
+        )
+
+        duration = time.perf_counter() - start_time
+        file_size = output.stat().st_size / 1024  # KB
+
+        return {
+            'source': str(source),
+            'output': str(output),
+            'success': result.success,
+            'error': result.error_message,
+            'size': file_size,
+            'duration': duration,
+            'image_count': result.image_count
+        }
+
+    except Exception as e:
+        duration = time.perf_counter() - start_time
+        return {
+            'source': str(source),
+            'output': str(output),
+            'success': False,
+            'error': str(e),
+            'size': 0,
+            'duration': duration,
+            'image_count': 0
+        }
+
+
+def _process_in_worker(
+    source: str,
+    output: str,
+    theme: str,
+    embed_images: bool,
+    process_mermaid: bool
+) -> dict:
+    """
+    在进程池的子进程中处理单个文件
+
+    参数只使用可 pickle 的基本类型，转换器在子进程内创建。
+
+    Args:
+        source: 源文件路径
+        output: 输出文件路径
+        theme: 主题
+        embed_images: 是否嵌入图片
+        process_mermaid: 是否处理Mermaid
+
+    Returns:
+        处理结果
+    """
+    global _worker_converter
+    if _worker_converter is None:
+        _worker_converter = HTMLConverter()
+    return _convert_file(
+        _worker_converter,
+        Path(source),
+        Path(output),
+        theme,
+        embed_images,
+        process_mermaid
+    )
+
 
 class BatchProcessor:
     """批量处理器"""
 
-    def __init__(self, max_workers: int = 4):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        executor_cls: Optional[Type[Executor]] = None
+    ):
         """
         初始化批量处理器
 
         Args:
             max_workers: 最大并发数
+            executor_cls: 执行器类型（默认根据任务自动选择进程池或线程池）
         """
         self.converter = HTMLConverter()
         self.scanner = FileScanner()
         self.max_workers = max_workers
+        self.executor_cls = executor_cls
         self.results = []
+        self._progress_lock = threading.Lock()
 
     def process_directory(
         self,
@@ -70,11 +179,8 @@ class BatchProcessor:
 
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # 扫描Markdown文件
-        if recursive:
-            md_files = list(input_dir.rglob(pattern))
-        else:
-            md_files = list(input_dir.glob(pattern))
+        # 扫描Markdown文件（os.scandir 遍历，不逐项 stat）
+        md_files = list(self.scanner.iter_files(input_dir, pattern, recursive))
 
         if not md_files:
             print(f"⚠️ 未找到匹配的Markdown文件: {pattern}")
@@ -89,8 +195,12 @@ class BatchProcessor:
         self._show_progress_header()
 
         # 批量处理
-        start_time = time.time()
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        start_time = time.perf_counter()
+        executor, use_processes = self._create_executor(
+            len(md_files), embed_images, process_mermaid
+        )
+
+        with executor:
             # 提交任务
             futures = {}
             for md_file in md_files:
@@ -99,8 +209,9 @@ class BatchProcessor:
                 output_file = output_dir / relative_path.with_suffix('.html')
                 output_file.parent.mkdir(parents=True, exist_ok=True)
 
-                future = executor.submit(
-                    self._process_file,
+                future = self._submit(
+                    executor,
+                    use_processes,
                     md_file,
                     output_file,
                     theme,
@@ -114,41 +225,89 @@ class BatchProcessor:
             for future in as_completed(futures):
                 completed += 1
                 md_file, output_file = futures[future]
-
-                try:
-                    result = future.result()
-                    self.results.append(result)
-                    self._show_progress(completed, len(md_files), result)
-                except Exception as e:
-                    result = {
-                        'source': str(md_file),
-                        'output': str(output_file),
-                        'success': False,
-                        'error': str(e),
-                        'size': 0,
-                        'duration': 0
-                    }
-                    self.results.append(result)
-                    self._show_progress(completed, len(md_files), result)
+                result = self._future_result(future, md_file, output_file)
+                self._record_result(completed, len(md_files), result)
 
         # 显示总结
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         self._show_summary(total_time)
 
         return self.results
 
-    def _process_file(
+    def _select_executor(
         self,
+        file_count: int,
+        embed_images: bool,
+        process_mermaid: bool
+    ) -> Type[Executor]:
+        """
+        选择批量转换使用的执行器
+
+        嵌入图片和处理 Mermaid 以 CPU 计算为主，受 GIL 限制时使用进程池；
+        只做 Markdown 转换的任务以 I/O 为主，文件较少或单核时进程启动开销
+        大于收益，这些情况使用线程池。
+
+        Args:
+            file_count: 待处理文件数
+            embed_images: 是否嵌入图片
+            process_mermaid: 是否处理Mermaid
+
+        Returns:
+            执行器类型
+        """
+        if self.executor_cls is not None:
+            return self.executor_cls
+
+        if not (embed_images or process_mermaid):
+            return ThreadPoolExecutor
+        if file_count < _PROCESS_MIN_FILES or self.max_workers <= 1:
+            return ThreadPoolExecutor
+        if (os.cpu_count() or 1) <= 1:
+            return ThreadPoolExecutor
+        return ProcessPoolExecutor
+
+    def _create_executor(
+        self,
+        file_count: int,
+        embed_images: bool,
+        process_mermaid: bool
+    ) -> Tuple[Executor, bool]:
+        """
+        创建执行器，平台不支持多进程时回退到线程池
+
+        Args:
+            file_count: 待处理文件数
+            embed_images: 是否嵌入图片
+            process_mermaid: 是否处理Mermaid
+
+        Returns:
+            (执行器, 是否为进程池)
+        """
+        executor_cls = self._select_executor(file_count, embed_images, process_mermaid)
+        try:
+            executor = executor_cls(max_workers=self.max_workers)
+        except (OSError, NotImplementedError):
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return executor, isinstance(executor, ProcessPoolExecutor)
+
+    def _submit(
+        self,
+        executor: Executor,
+        use_processes: bool,
         source: Path,
         output: Path,
         theme: str,
         embed_images: bool,
         process_mermaid: bool
-    ) -> dict:
+    ) -> Future:
         """
-        处理单个文件
+        提交单个文件的转换任务
+
+        进程池中只传递可 pickle 的字符串路径，由子进程自建转换器。
 
         Args:
+            executor: 执行器
+            use_processes: 执行器是否为进程池
             source: 源文件
             output: 输出文件
             theme: 主题
@@ -156,54 +315,109 @@ class BatchProcessor:
             process_mermaid: 是否处理Mermaid
 
         Returns:
-            处理结果
+            任务的 Future
         """
-        start_time = time.time()
-
-        try:
-            result = self.converter.convert(
-                source_path=source,
-                output_path=output,
-                theme=theme,
-                embed_images=embed_images,
-                process_mermaid=process_mermaid
+        if use_processes:
+            return executor.submit(
+                _process_in_worker,
+                str(source),
+                str(output),
+                theme,
+                embed_images,
+                process_mermaid
             )
+        return executor.submit(
+            self._process_file,
+            source,
+            output,
+            theme,
+            embed_images,
+            process_mermaid
+        )
 
-            duration = time.time() - start_time
-            file_size = output.stat().st_size / 1024  # KB
+    def _future_result(self, future: Future, source: Path, output: Path) -> dict:
+        """
+        获取任务结果，任务本身异常（如子进程崩溃）时转为失败结果
 
-            return {
-                'source': str(source),
-                'output': str(output),
-                'success': result.success,
-                'error': result.error_message,
-                'size': file_size,
-                'duration': duration,
-                'image_count': result.image_count
-            }
+        Args:
+            future: 已完成的任务
+            source: 源文件
+            output: 输出文件
 
+        Returns:
+            处理结果
+        """
+        try:
+            return future.result()
         except Exception as e:
-            duration = time.time() - start_time
             return {
                 'source': str(source),
                 'output': str(output),
                 'success': False,
                 'error': str(e),
                 'size': 0,
-                'duration': duration,
+                'duration': 0,
                 'image_count': 0
             }
 
+    def _process_file(
+        self,
+        source: Path,
+        output: Path,
+        theme: str,
+        embed_images: bool,
+        process_mermaid: bool
+    ) -> dict:
+        """
+        处理单个文件
+
+        Args:
+            source: 源文件
+            output: 输出文件
+            theme: 主题
+            embed_images: 是否嵌入图片
+            process_mermaid: 是否处理Mermaid
+
+        Returns:
+            处理结果
+        """
+        return _convert_file(
+            self.converter,
+            source,
+            output,
+            theme,
+            embed_images,
+            process_mermaid
+        )
+
     def _show_progress_header(self):
         """显示进度头"""
         print("=" * 70)
         print(f"{'文件名':<30} {'状态':<8} {'大小':<10} {'耗时':<8}")
         print("=" * 70)
 
+    def _record_result(self, completed: int, total: int, result: dict):
+        """
+        记录处理结果并显示进度
+
+        结果追加与进度输出在同一把锁内完成，保证 _show_summary 看到一致的状态。
+
+        Args:
+            completed: 已完成数
+            total: 总数
+            result: 处理结果
+        """
+        with self._progress_lock:
+            self.results.append(result)
+            self._show_progress(completed, total, result)
+
     def _show_progress(self, completed: int, total: int, result: dict):
         """
         显示进度
 
+        每个文件的状态行、进度条和错误信息拼成一个字符串一次写出；
+        进度条每 total/200 个文件才重绘一次，避免终端输出拖慢批量处理。
+
         Args:
             completed: 已完成数
             total: 总数
@@ -217,17 +431,22 @@ class BatchProcessor:
         size = f"{result['size']:.1f}KB" if result['success'] else "-"
         duration = f"{result['duration']:.2f}s"
 
-        # 显示进度条
-        progress = completed / total
-        bar_length = 20
-        filled = int(bar_length * progress)
-        bar = "█" * filled + "░" * (bar_length - filled)
+        lines = [f"{filename:<30} {status:<8} {size:<10} {duration:<8}\n"]
 
-        print(f"{filename:<30} {status:<8} {size:<10} {duration:<8}")
-        print(f"进度: [{bar}] {completed}/{total} ({progress*100:.1f}%)")
+        # 显示进度条（节流重绘）
+        step = max(1, total // 200)
+        if completed % step == 0 or completed == total:
+            progress = completed / total
+            bar_length = 20
+            filled = int(bar_length * progress)
+            bar = "█" * filled + "░" * (bar_length - filled)
+            lines.append(f"进度: [{bar}] {completed}/{total} ({progress*100:.1f}%)\n")
 
         if not result['success'] and result['error']:
-            print(f"  └─ 错误: {result['error']}")
+            lines.append(f"  └─ 错误: {result['error']}\n")
+
+        sys.stdout.write(''.join(lines))
+        sys.stdout.flush()
 
     def _show_summary(self, total_time: float):
         """
@@ -289,8 +508,10 @@ class BatchProcessor:
 
         self._show_progress_header()
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
+        # 检查文件并计算输出路径（保留在列表中的序号）
+        jobs = []
         for i, md_file in enumerate(file_list, 1):
             md_file = Path(md_file)
             if not md_file.exists():
@@ -298,19 +519,41 @@ class BatchProcessor:
                 continue
 
             output_file = output_dir / md_file.with_suffix('.html').name
+            jobs.append((i, md_file, output_file))
 
-            result = self._process_file(
-                md_file,
-                output_file,
-                theme,
-                embed_images,
-                process_mermaid
+        if jobs:
+            executor, use_processes = self._create_executor(
+                len(jobs), embed_images, process_mermaid
             )
 
-            self.results.append(result)
-            self._show_progress(i, len(file_list), result)
-
-        total_time = time.time() - start_time
+            with executor:
+                futures = {
+                    self._submit(
+                        executor,
+                        use_processes,
+                        md_file,
+                        output_file,
+                        theme,
+                        embed_images,
+                        process_mermaid
+                    ): position
+                    for position, (_, md_file, output_file) in enumerate(jobs)
+                }
+
+                # 结果按完成顺序到达，先缓存再按列表顺序输出，保证进度单调递增
+                ready = {}
+                next_position = 0
+                for future in as_completed(futures):
+                    position = futures[future]
+                    _, md_file, output_file = jobs[position]
+                    ready[position] = self._future_result(future, md_file, output_file)
+
+                    while next_position in ready:
+                        index = jobs[next_position][0]
+                        self._record_result(index, len(file_list), ready.pop(next_position))
+                        next_position += 1
+
+        total_time = time.perf_counter() - start_time
         self._show_summary(total_time)
 
         return self.results
@@ -6,18 +6,19 @@
 提供命令行交互功能
 """
 
+import os
 import sys
-import argparse
 from pathlib import Path
-from typing import List
-import time
+from types import SimpleNamespace
+from typing import List, Optional
 
-from src.core.converter import HTMLConverter
-from src.core.stats import StatsTracker
-from src.themes import list_themes
 from src.utils.file_scanner import FileScanner
 from src.utils.formatter import CLIFormatter
 
+# 内置主题名单：解析参数时据此检查 -t，无需导入主题模块；
+# 开始转换时再与 list_themes() 核对
+_KNOWN_THEMES = frozenset({'default', 'minimal', 'professional'})
+
 
 def main():
     """主函数"""
@@ -26,6 +27,135 @@ def main():
         from src.interactive import interactive_mode
         return interactive_mode()
 
+    # 常见的简单参数直接解析；帮助、未知参数或参数错误时交给 argparse
+    args = _parse_fast(sys.argv[1:])
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+        if args.theme not in _KNOWN_THEMES:
+            choices = ', '.join(repr(theme) for theme in sorted(_KNOWN_THEMES))
+            parser.error(
+                f"argument -t/--theme: invalid choice: {args.theme!r} (choose from {choices})"
+            )
+
+    # CLI 格式化器
+    formatter = CLIFormatter()
+
+    # 列出主题
+    if args.list_themes:
+        print_themes(formatter)
+        return 0
+
+    # 检查输入
+    if not args.input:
+        # 进入交互式模式
+        from src.interactive import interactive_mode
+        return interactive_mode()
+
+    try:
+        # 运行转换
+        return run_conversion(args, formatter)
+
+    except KeyboardInterrupt:
+        print("\n" + formatter.warning("用户中断"))
+        return 130
+
+    except Exception as e:
+        print(formatter.error(f"错误: {e}"))
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+# 快速解析支持的选项：选项 -> (属性名, 是否需要取值)
+_FAST_OPTIONS = {
+    '-o': ('output', True),
+    '--output': ('output', True),
+    '-t': ('theme', True),
+    '--theme': ('theme', True),
+    '-w': ('workers', True),
+    '--workers': ('workers', True),
+    '-r': ('recursive', False),
+    '--recursive': ('recursive', False),
+    '--no-images': ('no_images', False),
+    '--no-mermaid': ('no_mermaid', False),
+    '--list-themes': ('list_themes', False),
+    '--stats': ('stats', False),
+    '-v': ('verbose', False),
+    '--verbose': ('verbose', False),
+}
+
+
+def _parse_fast(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    不经过 argparse 直接解析命令行参数
+
+    只处理最简单的形式（每个选项单独一项，取值紧随其后）；遇到帮助、
+    未知选项、缺少或无效的取值时返回 None，由 argparse 输出与原来一致的
+    帮助和错误信息。
+
+    Args:
+        argv: 命令行参数（不含程序名）
+
+    Returns:
+        与 argparse 结果属性相同的命名空间，无法处理时返回 None
+    """
+    args = SimpleNamespace(
+        input=None,
+        output=None,
+        theme='default',
+        recursive=False,
+        no_images=False,
+        no_mermaid=False,
+        workers=None,
+        list_themes=False,
+        stats=False,
+        verbose=False
+    )
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg.startswith('-') and arg != '-':
+            option = _FAST_OPTIONS.get(arg)
+            if option is None:
+                return None
+            name, takes_value = option
+            if takes_value:
+                i += 1
+                if i >= len(argv) or argv[i].startswith('-'):
+                    return None
+                setattr(args, name, argv[i])
+            else:
+                setattr(args, name, True)
+        elif args.input is None:
+            args.input = arg
+        else:
+            return None
+        i += 1
+
+    if args.workers is not None:
+        try:
+            args.workers = int(args.workers)
+        except ValueError:
+            return None
+
+    if args.theme not in _KNOWN_THEMES:
+        return None
+
+    return args
+
+
+def _build_parser():
+    """
+    构建完整的 argparse 解析器（仅在快速解析无法处理时使用）
+
+    Returns:
+        argparse.ArgumentParser
+    """
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Markdown 转 HTML 报告工具",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -59,7 +189,7 @@ def main():
     parser.add_argument(
         '-t', '--theme',
         default='default',
-        choices=list_themes(),
+        metavar='{' + ','.join(sorted(_KNOWN_THEMES)) + '}',
         help='选择主题（默认: default）'
     )
 
@@ -81,6 +211,13 @@ def main():
         help='不处理 Mermaid 图表'
     )
 
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=None,
+        help='批量转换的并发进程数（默认: CPU 核数）'
+    )
+
     parser.add_argument(
         '--list-themes',
         action='store_true',
@@ -99,40 +236,13 @@ def main():
         help='显示详细输出'
     )
 
-    args = parser.parse_args()
-
-    # CLI 格式化器
-    formatter = CLIFormatter()
-
-    # 列出主题
-    if args.list_themes:
-        print_themes(formatter)
-        return 0
-
-    # 检查输入
-    if not args.input:
-        # 进入交互式模式
-        from src.interactive import interactive_mode
-        return interactive_mode()
-
-    try:
-        # 运行转换
-        return run_conversion(args, formatter)
-
-    except KeyboardInterrupt:
-        print("\n" + formatter.warning("用户中断"))
-        return 130
-
-    except Exception as e:
-        print(formatter.error(f"错误: {e}"))
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        return 1
+    return parser
 
 
 def print_themes(formatter: CLIFormatter):
     """打印可用主题"""
+    from src.themes import list_themes
+
     print(formatter.title("可用主题"))
     print()
 
@@ -151,6 +261,15 @@ def print_themes(formatter: CLIFormatter):
 
 def run_conversion(args, formatter: CLIFormatter) -> int:
     """运行转换"""
+    # 转换相关模块只在真正转换时导入
+    from src.core.converter import HTMLConverter
+    from src.core.stats import StatsTracker
+    from src.themes import list_themes
+
+    if args.theme not in list_themes():
+        print(formatter.error(f"未知主题: {args.theme}"))
+        return 1
+
     # 初始化组件
     converter = HTMLConverter()
     stats_tracker = StatsTracker()
@@ -166,8 +285,14 @@ def run_conversion(args, formatter: CLIFormatter) -> int:
     elif input_path.is_dir():
         # 目录
         files = scanner.scan_markdown_files(input_path, args.recursive)
+    elif os.sep not in args.input and (os.altsep is None or os.altsep not in args.input):
+        # 当前目录下的文件名通配符：scandir 按文件名匹配，不为每个条目构造 Path
+        files = [
+            f for f in scanner.iter_files(Path.cwd(), args.input, recursive=False)
+            if f.suffix == '.md'
+        ]
     else:
-        # 通配符
+        # 含路径的通配符
         files = list(Path.cwd().glob(args.input))
         files = [f for f in files if f.suffix == '.md']
 
@@ -204,30 +329,17 @@ def run_conversion(args, formatter: CLIFormatter) -> int:
     # 批量转换
     total = len(files)
     success_count = 0
+    completed = 0
+
+    def report_result(file_path: Path, result) -> None:
+        """显示单个文件的转换结果并更新统计（按完成顺序调用，每个文件一次写出）"""
+        nonlocal success_count, completed
+        completed += 1
+        lines = []
 
-    for i, file_path in enumerate(files, 1):
         # 显示进度
         if total > 1:
-            print(f"[{i}/{total}] {file_path.name}")
-
-        # 确定输出路径
-        if args.output and Path(args.output).suffix == '.html' and total == 1:
-            output_path = Path(args.output)
-        elif output_dir:
-            output_path = output_dir / f"{file_path.stem}.html"
-        else:
-            output_path = None
-
-        # 转换文件
-        start_time = time.time()
-
-        result = converter.convert(
-            source_path=file_path,
-            output_path=output_path,
-            theme=args.theme,
-            embed_images=not args.no_images,
-            process_mermaid=not args.no_mermaid
-        )
+            lines.append(f"[{completed}/{total}] {file_path.name}")
 
         # 更新统计
         stats_tracker.track_result(result, file_path)
@@ -235,15 +347,40 @@ def run_conversion(args, formatter: CLIFormatter) -> int:
         if result.success:
             success_count += 1
             if args.verbose or total == 1:
-                print(f"  ✓ 转换成功: {result.output_path.name}")
-                print(f"    文件大小: {result.file_size / 1024:.1f} KB")
-                print(f"    嵌入图片: {result.image_count} 张")
-                print(f"    耗时: {result.duration:.2f}s")
+                lines.append(f"  ✓ 转换成功: {result.output_path.name}")
+                lines.append(f"    文件大小: {result.file_size / 1024:.1f} KB")
+                lines.append(f"    嵌入图片: {result.image_count} 张")
+                lines.append(f"    耗时: {result.duration:.2f}s")
         else:
-            print(f"  ✗ 转换失败: {result.error_message}")
+            lines.append(f"  ✗ 转换失败: {result.error_message}")
+
+        if total > 1 and completed < total:
+            lines.append("")
+
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
 
-        if total > 1 and i < total:
-            print()
+    if args.output and Path(args.output).suffix == '.html' and total == 1:
+        # 单个文件，指定了输出文件名
+        result = converter.convert(
+            source_path=files[0],
+            output_path=Path(args.output),
+            theme=args.theme,
+            embed_images=not args.no_images,
+            process_mermaid=not args.no_mermaid
+        )
+        report_result(files[0], result)
+    else:
+        # 文件较多时由转换器使用进程池并行转换
+        converter.convert_batch(
+            files,
+            output_dir=output_dir,
+            theme=args.theme,
+            embed_images=not args.no_images,
+            process_mermaid=not args.no_mermaid,
+            max_workers=args.workers,
+            on_result=report_result
+        )
 
     # 显示统计
     if args.stats or total > 1:
@@ -6,10 +6,16 @@
 管理用户配置和偏好设置
 """
 
+import copy
 import json
 import os
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+# 目录 mtime 距今不足该时长时不缓存预设列表：时间戳精度较粗的文件系统上
+# （FAT 为 2 秒），同一时刻内的后续修改不会改变目录的 mtime
+_PRESET_CACHE_MIN_AGE_NS = 2 * 10 ** 9
 
 
 class ConfigManager:
@@ -33,6 +39,9 @@ class ConfigManager:
         }
     }
 
+    # 已解析的配置文件：路径 -> ((st_mtime_ns, st_size), 合并默认值后的配置)，同一进程内共享
+    _CACHE: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
     def __init__(self, config_dir: Optional[Path] = None):
         """
         初始化配置管理器
@@ -50,8 +59,18 @@ class ConfigManager:
         self.presets_dir = self.config_dir / 'presets'
         self.presets_dir.mkdir(exist_ok=True)
 
+        # set/update/reset 只标记为已修改，由 flush 统一写盘
+        self._dirty = False
+        # 预设列表缓存：(预设目录的 st_mtime_ns, 预设名称列表)
+        self._preset_cache: Optional[Tuple[int, list]] = None
         self.config = self.load_config()
 
+    def __enter__(self) -> 'ConfigManager':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
     def load_config(self) -> Dict[str, Any]:
         """
         加载配置文件
@@ -61,10 +80,20 @@ class ConfigManager:
         """
         if self.config_file.exists():
             try:
+                # 文件未修改时直接复用上次解析的结果
+                # 粗粒度时间戳的文件系统上同一时刻的两次写入 mtime 相同，再比较文件大小
+                st = self.config_file.stat()
+                key = (st.st_mtime_ns, st.st_size)
+                cached = self._CACHE.get(self.config_file)
+                if cached is not None and cached[0] == key:
+                    return copy.deepcopy(cached[1])
+
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     config = json.load(f)
-                    # 合并默认配置（处理新增配置项）
-                    return self._merge_configs(self.DEFAULT_CONFIG, config)
+                # 合并默认配置（处理新增配置项）
+                merged = self._merge_configs(self.DEFAULT_CONFIG, config)
+                self._CACHE[self.config_file] = (key, copy.deepcopy(merged))
+                return merged
             except (json.JSONDecodeError, IOError) as e:
                 print(f"⚠️ 配置文件读取失败，使用默认配置: {e}")
                 return self.DEFAULT_CONFIG.copy()
@@ -83,17 +112,39 @@ class ConfigManager:
         Returns:
             是否成功
         """
-        if config is None:
+        is_current = config is None
+        if is_current:
             config = self.config
 
+        # 只在写盘时加载分析模块，读取配置不受其导入开销影响
+        from .analyzers._io import write_atomic
+
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            # 原子替换写入，读取方不会看到写了一半的配置
+            write_atomic(
+                self.config_file,
+                json.dumps(config, ensure_ascii=False, indent=2).encode('utf-8')
+            )
+            # 文件内容已变，丢弃解析缓存，下次加载时重新读取
+            self._CACHE.pop(self.config_file, None)
+            if is_current:
+                self._dirty = False
             return True
         except IOError as e:
             print(f"❌ 配置文件保存失败: {e}")
             return False
 
+    def flush(self) -> bool:
+        """
+        将未保存的修改写入配置文件（没有修改时不写盘）
+
+        Returns:
+            是否成功
+        """
+        if not self._dirty:
+            return True
+        return self.save_config()
+
     def get(self, key: str, default: Any = None) -> Any:
         """
         获取配置值
@@ -135,7 +186,7 @@ class ConfigManager:
 
         # 设置值
         config[keys[-1]] = value
-        self.save_config()
+        self._dirty = True
 
     def update(self, updates: Dict[str, Any]) -> None:
         """
@@ -145,12 +196,12 @@ class ConfigManager:
             updates: 更新字典
         """
         self.config = self._merge_configs(self.config, updates)
-        self.save_config()
+        self._dirty = True
 
     def reset(self) -> None:
         """重置为默认配置"""
         self.config = self.DEFAULT_CONFIG.copy()
-        self.save_config()
+        self._dirty = True
 
     def save_preset(self, name: str, config: Optional[Dict[str, Any]] = None) -> bool:
         """
@@ -171,6 +222,7 @@ class ConfigManager:
         try:
             with open(preset_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, ensure_ascii=False, indent=2)
+            self._preset_cache = None
             print(f"✅ 预设保存成功: {name}")
             return True
         except IOError as e:
@@ -226,10 +278,22 @@ class ConfigManager:
         Returns:
             预设名称列表
         """
+        # 预设目录未变化时复用上次的列表
+        try:
+            mtime_ns = os.stat(self.presets_dir).st_mtime_ns
+        except OSError:
+            return []
+        if self._preset_cache is not None and self._preset_cache[0] == mtime_ns:
+            return list(self._preset_cache[1])
+
         presets = []
         for file in self.presets_dir.glob("*.json"):
             presets.append(file.stem)
-        return sorted(presets)
+        presets.sort()
+
+        if time.time_ns() - mtime_ns >= _PRESET_CACHE_MIN_AGE_NS:
+            self._preset_cache = (mtime_ns, presets)
+        return list(presets)
 
     def delete_preset(self, name: str) -> bool:
         """
@@ -246,6 +310,7 @@ class ConfigManager:
         if preset_file.exists():
             try:
                 preset_file.unlink()
+                self._preset_cache = None
                 print(f"✅ 预设删除成功: {name}")
                 return True
             except IOError as e:
@@ -308,11 +373,18 @@ class ConfigManager:
         """
         result = base.copy()
 
-        for key, value in update.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_configs(result[key], value)
-            else:
-                result[key] = value
+        # 用工作栈代替递归：(目标字典, 更新字典)，目标字典均为副本，不修改 base
+        stack = [(result, update)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    merged = current.copy()
+                    target[key] = merged
+                    stack.append((merged, value))
+                else:
+                    target[key] = value
 
         return result
 
@@ -326,7 +398,14 @@ class ConfigManager:
         return json.dumps(self.config, ensure_ascii=False, indent=2)
 
     def interactive_config(self):
-        """交互式配置"""
+        """交互式配置（退出时统一保存修改）"""
+        try:
+            self._interactive_loop()
+        finally:
+            self.flush()
+
+    def _interactive_loop(self):
+        """交互式配置菜单循环"""
         while True:
             print("\n" + "=" * 50)
             print("⚙️  配置管理器")
@@ -6,13 +6,54 @@ HTML 转换器核心模块
 负责 Markdown 到 HTML 的转换核心逻辑
 """
 
-import markdown
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, Any, Callable, List
 from dataclasses import dataclass
-from datetime import datetime
 
 from src.processors import ImageProcessor, MermaidProcessor
+from src.themes import BaseTheme, get_theme
+
+if TYPE_CHECKING:
+    # markdown 及其扩展（含 Pygments）导入较慢，只在首次转换时导入，
+    # 使 --help、--list-themes 等不做转换的命令无需加载
+    import markdown
+
+# 批量转换时文件数少于该值则串行处理，避免进程启动开销
+_BATCH_PARALLEL_MIN_FILES = 8
+
+# 批量转换子进程内复用的转换器（由进程池 initializer 创建）
+_batch_converter: Optional['HTMLConverter'] = None
+
+
+def _read_markdown(source_path: Path) -> str:
+    """
+    读取 Markdown 文件
+
+    一次读入原始字节后解码，换行符统一为 '\\n'（与文本模式读取一致）。
+
+    Args:
+        source_path: 源文件路径
+
+    Returns:
+        文件内容
+    """
+    with open(source_path, 'rb') as f:
+        content = f.read().decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+@lru_cache(maxsize=8)
+def _theme_instance(name: str) -> BaseTheme:
+    """按名称缓存主题实例（主题无状态，可在多次转换间共享）"""
+    return get_theme(name)
 
 
 @dataclass
@@ -68,6 +109,32 @@ class HTMLConverter:
             }
         }
 
+        # 每个线程持有一个常驻的 Markdown 实例（实例本身不是线程安全的）
+        self._local = threading.local()
+
+    def _get_markdown(self) -> 'markdown.Markdown':
+        """
+        获取当前线程复用的 Markdown 实例
+
+        扩展只在首次使用时加载，之后每次转换前 reset 清除上次的状态
+        （目录、元数据、脚注等）。
+
+        Returns:
+            Markdown 实例
+        """
+        md = getattr(self._local, 'md', None)
+        if md is None:
+            import markdown
+
+            md = markdown.Markdown(
+                extensions=self.md_extensions,
+                extension_configs=self.md_extension_configs
+            )
+            self._local.md = md
+        else:
+            md.reset()
+        return md
+
     def convert(
         self,
         source_path: Path,
@@ -89,7 +156,7 @@ class HTMLConverter:
         Returns:
             转换结果
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
             # 检查源文件
@@ -104,72 +171,161 @@ class HTMLConverter:
                 )
 
             # 读取 Markdown 内容
-            md_content = source_path.read_text(encoding='utf-8')
-
-            # 处理图片
-            image_count = 0
-            if embed_images:
-                md_content, image_count = self.image_processor.process(
-                    md_content,
-                    source_path.parent
-                )
+            md_content = _read_markdown(source_path)
 
-            # 处理 Mermaid
-            if process_mermaid:
-                md_content = self.mermaid_processor.process(md_content)
+            # 确定输出路径
+            if output_path is None:
+                output_path = source_path.with_suffix('.html')
 
-            # 转换为 HTML
-            md = markdown.Markdown(
-                extensions=self.md_extensions,
-                extension_configs=self.md_extension_configs
+            return self._convert_content(
+                md_content,
+                output_path,
+                source_path.stem,
+                source_path.parent,
+                theme,
+                embed_images,
+                process_mermaid,
+                start_time
             )
 
-            html_body = md.convert(md_content)
-            toc_html = getattr(md, 'toc', '')
-
-            # 获取元数据
-            metadata = getattr(md, 'Meta', {})
-            title = metadata.get('title', [source_path.stem])[0] if metadata else source_path.stem
-
-            # 生成完整 HTML
-            full_html = self._create_html_document(
-                html_body,
-                toc_html,
-                title,
-                theme,
-                image_count,
-                process_mermaid
+        except Exception as e:
+            duration = time.perf_counter() - start_time
+            return ConversionResult(
+                success=False,
+                output_path=output_path or source_path.with_suffix('.html'),
+                file_size=0,
+                image_count=0,
+                duration=duration,
+                error_message=str(e)
             )
 
-            # 确定输出路径
-            if output_path is None:
-                output_path = source_path.with_suffix('.html')
+    def convert_text(
+        self,
+        md_content: str,
+        output_path: Path,
+        title: Optional[str] = None,
+        base_dir: Optional[Path] = None,
+        theme: str = "default",
+        embed_images: bool = True,
+        process_mermaid: bool = True
+    ) -> ConversionResult:
+        """
+        转换内存中的 Markdown 文本为 HTML
 
-            # 写入文件
-            output_path.write_text(full_html, encoding='utf-8')
+        与 convert 走同一条处理流程，但不需要先把 Markdown 落盘。
 
-            # 计算耗时
-            duration = (datetime.now() - start_time).total_seconds()
+        Args:
+            md_content: Markdown 文本
+            output_path: 输出路径
+            title: 默认标题（元数据中没有 title 时使用，缺省为输出文件名）
+            base_dir: 解析相对图片路径的基准目录（缺省为输出目录）
+            theme: 主题名称
+            embed_images: 是否嵌入图片
+            process_mermaid: 是否处理 Mermaid 图表
 
-            return ConversionResult(
-                success=True,
-                output_path=output_path,
-                file_size=output_path.stat().st_size,
-                image_count=image_count,
-                duration=duration
+        Returns:
+            转换结果
+        """
+        start_time = time.perf_counter()
+
+        try:
+            return self._convert_content(
+                md_content,
+                output_path,
+                title or output_path.stem,
+                base_dir or output_path.parent,
+                theme,
+                embed_images,
+                process_mermaid,
+                start_time
             )
 
         except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             return ConversionResult(
                 success=False,
-                output_path=output_path or source_path.with_suffix('.html'),
+                output_path=output_path,
                 file_size=0,
                 image_count=0,
                 duration=duration,
                 error_message=str(e)
             )
 
+    def _convert_content(
+        self,
+        md_content: str,
+        output_path: Path,
+        default_title: str,
+        base_dir: Path,
+        theme: str,
+        embed_images: bool,
+        process_mermaid: bool,
+        start_time: float
+    ) -> ConversionResult:
+        """
+        Markdown 文本到 HTML 文件的公共处理流程
+
+        Args:
+            md_content: Markdown 文本
+            output_path: 输出路径
+            default_title: 元数据中没有 title 时使用的标题
+            base_dir: 解析相对图片路径的基准目录
+            theme: 主题名称
+            embed_images: 是否嵌入图片
+            process_mermaid: 是否处理 Mermaid 图表
+            start_time: 转换开始时刻（time.perf_counter）
+
+        Returns:
+            转换结果
+        """
+        # 处理图片（不含图片语法时无需扫描）
+        image_count = 0
+        if embed_images and '![' in md_content:
+            md_content, image_count = self.image_processor.process(
+                md_content,
+                base_dir
+            )
+
+        # 处理 Mermaid（不含 mermaid 代码块时无需扫描）
+        if process_mermaid and '```mermaid' in md_content:
+            md_content = self.mermaid_processor.process(md_content)
+
+        # 转换为 HTML
+        md = self._get_markdown()
+
+        html_body = md.convert(md_content)
+        toc_html = getattr(md, 'toc', '')
+
+        # 获取元数据
+        metadata = getattr(md, 'Meta', {})
+        title = metadata.get('title', [default_title])[0] if metadata else default_title
+
+        # 生成完整 HTML
+        full_html = self._create_html_document(
+            html_body,
+            toc_html,
+            title,
+            theme,
+            image_count,
+            process_mermaid
+        )
+
+        # 写入文件
+        encoded = full_html.encode('utf-8')
+        with open(output_path, 'wb') as f:
+            f.write(encoded)
+
+        # 计算耗时
+        duration = time.perf_counter() - start_time
+
+        return ConversionResult(
+            success=True,
+            output_path=output_path,
+            file_size=len(encoded),
+            image_count=image_count,
+            duration=duration
+        )
+
     def _create_html_document(
         self,
         body_html: str,
@@ -193,12 +349,7 @@ class HTMLConverter:
         Returns:
             完整的 HTML 文档
         """
-        # 动态导入主题
-        from src.themes import get_theme
-
-        theme_instance = get_theme(theme)
-
-        return theme_instance.render(
+        return _theme_instance(theme).render(
             body_html=body_html,
             toc_html=toc_html,
             title=title,
@@ -209,41 +360,134 @@ class HTMLConverter:
 
     def convert_batch(
         self,
-        source_paths: list[Path],
+        source_paths: List[Path],
         output_dir: Optional[Path] = None,
         theme: str = "default",
         embed_images: bool = True,
-        process_mermaid: bool = True
-    ) -> list[ConversionResult]:
+        process_mermaid: bool = True,
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[Path, ConversionResult], None]] = None
+    ) -> List[ConversionResult]:
         """
         批量转换
 
+        各文件的转换互不依赖且以 CPU 计算为主，文件较多时使用进程池并行；
+        文件较少、只有一个工作进程或进程池不可用时串行处理。
+
         Args:
             source_paths: 源文件路径列表
             output_dir: 输出目录
             theme: 主题
             embed_images: 是否嵌入图片
             process_mermaid: 是否处理 Mermaid
+            max_workers: 最大进程数（默认读取 batch_settings.max_workers，否则为 CPU 核数）
+            on_result: 每个文件完成时的回调，参数为源文件路径和转换结果（按完成顺序调用）
 
         Returns:
-            转换结果列表
+            转换结果列表（与 source_paths 顺序一致）
         """
-        results = []
-
+        jobs = []
         for source_path in source_paths:
             if output_dir:
                 output_path = output_dir / f"{source_path.stem}.html"
             else:
                 output_path = None
+            jobs.append((source_path, output_path, theme, embed_images, process_mermaid))
 
-            result = self.convert(
-                source_path,
-                output_path,
-                theme,
-                embed_images,
-                process_mermaid
+        if max_workers is None:
+            max_workers = (
+                self.config.get('batch_settings', {}).get('max_workers')
+                or os.cpu_count()
+                or 1
             )
 
-            results.append(result)
+        results: List[Optional[ConversionResult]] = [None] * len(jobs)
 
-        return results
\ No newline at end of file
+        if max_workers > 1 and len(jobs) >= _BATCH_PARALLEL_MIN_FILES:
+            try:
+                executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_batch_worker,
+                    initargs=(self.config,)
+                )
+            except (OSError, NotImplementedError) as e:
+                print(f"⚠️ 无法启动进程池，改为串行转换: {e}")
+                executor = None
+
+            if executor is not None:
+                with executor:
+                    futures = {}
+                    try:
+                        for index, job in enumerate(jobs):
+                            futures[executor.submit(_convert_one, *job)] = index
+                    except (BrokenProcessPool, OSError) as e:
+                        # 未能提交的文件在下方串行转换
+                        print(f"⚠️ 进程池不可用，剩余文件改为串行转换: {e}")
+
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        try:
+                            results[index] = future.result()
+                        except Exception as e:
+                            # 任务已提交但执行失败，记为失败结果，不再重新转换
+                            source_path, output_path = jobs[index][:2]
+                            results[index] = ConversionResult(
+                                success=False,
+                                output_path=output_path or source_path.with_suffix('.html'),
+                                file_size=0,
+                                image_count=0,
+                                duration=0,
+                                error_message=str(e)
+                            )
+                        if on_result:
+                            on_result(source_paths[index], results[index])
+
+        for index, job in enumerate(jobs):
+            if results[index] is None:
+                results[index] = self.convert(*job)
+                if on_result:
+                    on_result(source_paths[index], results[index])
+
+        return results
+
+
+def _init_batch_worker(config: Dict[str, Any]) -> None:
+    """
+    批量转换子进程的初始化函数
+
+    每个子进程创建一次转换器，避免随任务 pickle 处理器实例。
+
+    Args:
+        config: 配置字典
+    """
+    global _batch_converter
+    _batch_converter = HTMLConverter(config)
+
+
+def _convert_one(
+    source_path: Path,
+    output_path: Optional[Path],
+    theme: str,
+    embed_images: bool,
+    process_mermaid: bool
+) -> ConversionResult:
+    """
+    在子进程中转换单个文件
+
+    Args:
+        source_path: 源文件路径
+        output_path: 输出路径（可选）
+        theme: 主题名称
+        embed_images: 是否嵌入图片
+        process_mermaid: 是否处理 Mermaid 图表
+
+    Returns:
+        转换结果
+    """
+    return _batch_converter.convert(
+        source_path,
+        output_path,
+        theme,
+        embed_images,
+        process_mermaid
+    )
\ No newline at end of file
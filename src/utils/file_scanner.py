@@ -6,8 +6,76 @@
 扫描和查找 Markdown 文件
 """
 
+import fnmatch
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterator, List, Tuple
+
+# 并行遍历顶层子目录的最大线程数（os.scandir 会释放 GIL，网络文件系统上收益明显）
+_SCAN_MAX_WORKERS = 8
+
+
+def _name_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    构造文件名匹配函数
+
+    形如 "*.md" 的后缀模式在大小写敏感的平台上直接用 endswith 比较，
+    其余模式编译为正则（大小写规则与 fnmatch 一致）。
+    """
+    case_insensitive = os.path.normcase('A') == 'a'
+    suffix = pattern[1:]
+    if pattern.startswith('*') and not any(c in suffix for c in '*?[') and not case_insensitive:
+        return lambda name: name.endswith(suffix)
+    flags = re.IGNORECASE if case_insensitive else 0
+    return re.compile(fnmatch.translate(pattern), flags).match
+
+
+def _scan_dir(directory: str, suffixes: Tuple[str, ...]) -> Tuple[List[Path], List[str]]:
+    """
+    读取单个目录，按文件名后缀筛选文件
+
+    Args:
+        directory: 目录路径
+        suffixes: 文件名后缀（已按 os.path.normcase 规范化）
+
+    Returns:
+        (匹配的文件列表, 子目录路径列表)，目录无法读取时均为空
+    """
+    files = []
+    subdirs = []
+    normcase = os.path.normcase
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif normcase(entry.name).endswith(suffixes) and entry.is_file():
+                    files.append(Path(entry.path))
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def _walk_dir(directory: str, suffixes: Tuple[str, ...]) -> List[Path]:
+    """
+    递归收集目录树中后缀匹配的文件（不跟随指向目录的符号链接）
+
+    Args:
+        directory: 目录路径
+        suffixes: 文件名后缀（已按 os.path.normcase 规范化）
+
+    Returns:
+        匹配的文件列表
+    """
+    files = []
+    stack = [directory]
+    while stack:
+        dir_files, subdirs = _scan_dir(stack.pop(), suffixes)
+        files.extend(dir_files)
+        stack.extend(subdirs)
+    return files
 
 
 class FileScanner:
@@ -40,24 +108,68 @@ class FileScanner:
         if not directory.exists():
             return []
 
-        files = []
+        # 只比较 DirEntry 的文件名后缀，不为每个条目构造 Path 或 stat
+        suffixes = tuple(os.path.normcase(ext) for ext in self.markdown_extensions)
+        files, subdirs = _scan_dir(str(directory), suffixes)
 
         if recursive:
-            # 递归扫描
-            for ext in self.markdown_extensions:
-                pattern = f"**/*{ext}"
-                files.extend(directory.glob(pattern))
-        else:
-            # 仅扫描当前目录
-            for ext in self.markdown_extensions:
-                pattern = f"*{ext}"
-                files.extend(directory.glob(pattern))
-
-        # 排序并去重
-        files = sorted(set(files))
+            # 各顶层子目录互不相关，多个时用线程池并行遍历
+            if len(subdirs) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(_SCAN_MAX_WORKERS, len(subdirs))
+                ) as executor:
+                    for subdir_files in executor.map(
+                        lambda subdir: _walk_dir(subdir, suffixes), subdirs
+                    ):
+                        files.extend(subdir_files)
+            else:
+                for subdir in subdirs:
+                    files.extend(_walk_dir(subdir, suffixes))
+
+        # 排序
+        files.sort()
 
         return files
 
+    def iter_files(
+        self,
+        directory: Path,
+        pattern: str = "*.md",
+        recursive: bool = True
+    ) -> Iterator[Path]:
+        """
+        按文件名模式逐个产出目录中的文件
+
+        基于 os.scandir 的先序遍历：复用目录读取得到的类型信息，
+        不为每个条目 stat，也不跟随指向目录的符号链接（与 rglob 一致）。
+
+        Args:
+            directory: 目录路径
+            pattern: 文件名匹配模式
+            recursive: 是否递归子目录
+
+        Yields:
+            匹配的文件路径
+        """
+        match_name = _name_matcher(pattern)
+        stack = [str(directory)]
+
+        while stack:
+            subdirs = []
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                subdirs.append(entry.path)
+                        elif match_name(entry.name) and entry.is_file():
+                            yield Path(entry.path)
+            except OSError:
+                continue
+
+            # 逆序入栈，保持先序遍历顺序
+            stack.extend(reversed(subdirs))
+
     def find_images(self, directory: Path = None) -> List[Path]:
         """
         查找目录中的图片文件
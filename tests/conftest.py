@@ -0,0 +1,10 @@
+"""
+测试公共配置
+
+将项目根目录加入导入路径，使测试可以直接导入 src 包。
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
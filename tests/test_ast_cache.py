@@ -0,0 +1,79 @@
+"""
+AstCache 失效规则测试
+
+mtime 与大小一致时直接命中；仅元数据变化而内容相同时按内容摘要命中；
+内容变化时未命中；禁用或格式版本不符时不复用旧数据。
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from src.analyzers._ast_cache import _CACHE_FILE, AstCache
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'mod.py'
+    path.write_bytes(b'x = 1\n')
+    return path
+
+
+def _prime(project, path, facts='facts'):
+    """首次查找必然未命中，写回计算结果"""
+    cache = AstCache(project)
+    cached, pending = cache.lookup(path)
+    assert cached is None and pending[0] == path.read_bytes()
+    cache.store(path, pending, facts)
+    cache.close()
+
+
+def _lookup(project, path):
+    cache = AstCache(project)
+    try:
+        return cache.lookup(path)
+    finally:
+        cache.close()
+
+
+def test_unchanged_file_hits(tmp_path, source):
+    _prime(tmp_path, source)
+    assert _lookup(tmp_path, source) == ('facts', None)
+
+
+def test_touched_file_with_same_content_hits(tmp_path, source):
+    _prime(tmp_path, source)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert _lookup(tmp_path, source) == ('facts', None)
+
+
+@pytest.mark.parametrize('content', [b'x = 2\n', b'x = 1\ny = 2\n'])
+def test_changed_content_misses(tmp_path, source, content):
+    _prime(tmp_path, source)
+    source.write_bytes(content)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    cached, pending = _lookup(tmp_path, source)
+    assert cached is None
+    assert pending[0] == content
+
+
+def test_disabled_cache_does_not_touch_disk(tmp_path, source):
+    cache = AstCache(tmp_path, enabled=False)
+    cached, pending = cache.lookup(source)
+    cache.store(source, pending, 'facts')
+    cache.close()
+    assert cached is None and pending[0] == b'x = 1\n'
+    assert not (tmp_path / _CACHE_FILE).exists()
+
+
+def test_version_mismatch_discards_entries(tmp_path, source):
+    _prime(tmp_path, source)
+    conn = sqlite3.connect(str(tmp_path / _CACHE_FILE))
+    conn.execute('PRAGMA user_version = 0')
+    conn.commit()
+    conn.close()
+    cached, pending = _lookup(tmp_path, source)
+    assert cached is None and pending is not None
@@ -0,0 +1,77 @@
+"""
+命令行参数解析测试
+
+_parse_fast 绕过 argparse 解析常见参数：能处理时结果必须与 argparse 一致，
+不能处理时必须返回 None，交给 argparse 输出帮助或错误信息。
+"""
+
+import pytest
+
+from src.cli import _KNOWN_THEMES, _build_parser, _parse_fast
+
+
+def _parse_with_argparse(argv):
+    """按 main() 的回退路径解析参数，返回属性字典"""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.theme not in _KNOWN_THEMES:
+        parser.error(f"argument -t/--theme: invalid choice: {args.theme!r}")
+    return vars(args)
+
+
+@pytest.mark.parametrize('argv', [
+    [],
+    ['report.md'],
+    ['-'],
+    ['report.md', '-o', 'out/'],
+    ['report.md', '--output', 'out/', '--theme', 'minimal'],
+    ['-t', 'professional', 'report.md'],
+    ['docs/', '-r', '-w', '4', '--stats'],
+    ['docs/', '--recursive', '--workers', '2', '--verbose'],
+    ['report.md', '--no-images', '--no-mermaid', '-v'],
+    ['--list-themes'],
+])
+def test_fast_parse_matches_argparse(argv):
+    """快速解析能处理的参数与 argparse 结果完全一致"""
+    args = _parse_fast(argv)
+    assert args is not None
+    assert vars(args) == _parse_with_argparse(argv)
+
+
+@pytest.mark.parametrize('argv', [
+    # 合并的短选项
+    ['report.md', '-rv'],
+    # --选项=取值
+    ['report.md', '--theme=minimal'],
+    ['docs/', '--workers=4'],
+    # 短选项紧跟取值
+    ['report.md', '-tminimal'],
+    # -- 之后全部按位置参数处理
+    ['--', 'report.md'],
+    # 取值以 - 开头（argparse 将 -1 视为取值）
+    ['docs/', '-w', '-1'],
+])
+def test_fast_parse_defers_valid_forms_to_argparse(argv):
+    """快速解析不处理的合法写法交给 argparse"""
+    assert _parse_fast(argv) is None
+    _parse_with_argparse(argv)
+
+
+@pytest.mark.parametrize('argv', [
+    ['report.md', '-t'],
+    ['report.md', '--theme'],
+    ['report.md', '-t', '-r'],
+    ['report.md', '-t', 'unknown'],
+    ['report.md', '--theme', 'Default'],
+    ['docs/', '-w'],
+    ['docs/', '--workers', 'four'],
+    ['docs/', '-w', '1.5'],
+    ['report.md', '--unknown'],
+    ['a.md', 'b.md'],
+    ['-h'],
+])
+def test_fast_parse_defers_errors_to_argparse(argv):
+    """缺少或无效的取值、未知选项与帮助都由 argparse 处理并退出"""
+    assert _parse_fast(argv) is None
+    with pytest.raises(SystemExit):
+        _parse_with_argparse(argv)
@@ -0,0 +1,84 @@
+"""
+CodeInsightSkill 单文件缓存与分析预算测试
+
+单文件的分桶结果按 (mtime, 大小) 缓存，文件变化后重新解析；
+分析预算按访问的 AST 节点计数，每个节点恰好计一次。
+"""
+
+import ast
+import os
+
+import pytest
+
+from skills import code_insight
+from skills.code_insight import _CACHE_DIR, _InsightVisitor, _analyze_one_file, _new_buckets
+
+SOURCE = b'''
+import os
+
+TABLE = {"a": [1, 2, 3], "b": (4, 5)}
+
+
+class Base:
+    LIMIT = max(1, 2)
+
+    def run(self, n):
+        return self.run(n - 1) if n else os.getcwd()
+
+
+def gen():
+    yield [x * 2 for x in range(3)]
+'''
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'mod.py'
+    path.write_bytes(SOURCE)
+    return path
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """统计 ast.parse 调用次数"""
+    calls = []
+    original = ast.parse
+
+    def parse(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(code_insight.ast, 'parse', parse)
+    return calls
+
+
+def test_unchanged_file_is_served_from_cache(tmp_path, source, parse_calls):
+    first = _analyze_one_file(source, tmp_path)
+    assert len(parse_calls) == 1
+    assert any((tmp_path / _CACHE_DIR).iterdir())
+
+    second = _analyze_one_file(source, tmp_path)
+    assert len(parse_calls) == 1
+    assert second[1] == first[1]
+    assert [f['function'] for f in second[0]['functions']] == ['run', 'gen']
+
+
+def test_changed_file_is_reparsed(tmp_path, source, parse_calls):
+    _analyze_one_file(source, tmp_path)
+    source.write_bytes(SOURCE + b'\n\ndef extra():\n    pass\n')
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    buckets, _ = _analyze_one_file(source, tmp_path)
+    assert len(parse_calls) == 2
+    assert [f['function'] for f in buckets['functions']] == ['run', 'gen', 'extra']
+
+
+def test_node_budget_counts_each_visited_node_once():
+    tree = ast.parse(SOURCE)
+    visitor = _InsightVisitor('mod.py', _new_buckets())
+    visitor.visit(tree)
+
+    # 导入语句的 alias 子节点不会被访问，其余节点各计一次
+    aliases = sum(isinstance(node, ast.alias) for node in ast.walk(tree))
+    assert visitor.node_count == sum(1 for _ in ast.walk(tree)) - aliases
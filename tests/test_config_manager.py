@@ -0,0 +1,93 @@
+"""
+ConfigManager 缓存测试
+
+解析后的配置按 (mtime, 大小) 缓存；文件被外部修改或经 save_config 写入后
+必须重新读取，调用方拿到的配置互不影响。预设列表按预设目录的 mtime 缓存。
+"""
+
+import json
+import os
+
+from src.config_manager import ConfigManager
+
+
+def _write_config(manager, config, keep_mtime=False):
+    """在 ConfigManager 之外改写配置文件，可保持原有的 mtime"""
+    stat = manager.config_file.stat()
+    manager.config_file.write_text(json.dumps(config), encoding='utf-8')
+    if keep_mtime:
+        os.utime(manager.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_loaded_configs_are_independent_copies(tmp_path):
+    manager = ConfigManager(tmp_path)
+    first = manager.load_config()
+    first['theme'] = 'changed'
+    first['batch_settings']['max_workers'] = 99
+    assert manager.load_config() == ConfigManager.DEFAULT_CONFIG
+
+
+def test_external_edit_is_reloaded(tmp_path):
+    manager = ConfigManager(tmp_path)
+    manager.load_config()
+    _write_config(manager, {'theme': 'minimal'})
+    assert manager.load_config()['theme'] == 'minimal'
+
+
+def test_same_mtime_different_size_is_reloaded(tmp_path):
+    manager = ConfigManager(tmp_path)
+    manager.load_config()
+    _write_config(manager, {'theme': 'professional'}, keep_mtime=True)
+    assert manager.load_config()['theme'] == 'professional'
+
+
+def test_save_config_invalidates_cache(tmp_path):
+    manager = ConfigManager(tmp_path)
+    manager.set('theme', 'minimal')
+    assert manager.flush()
+    assert ConfigManager(tmp_path).config['theme'] == 'minimal'
+
+    # 写入的是不同配置对象时同样生效
+    manager.save_config({**manager.config, 'theme': 'professional'})
+    assert manager.load_config()['theme'] == 'professional'
+
+
+def test_save_leaves_no_temporary_files(tmp_path):
+    manager = ConfigManager(tmp_path)
+    manager.set('theme', 'minimal')
+    manager.flush()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['config.json', 'presets']
+
+
+def test_preset_list_follows_save_and_delete(tmp_path):
+    manager = ConfigManager(tmp_path)
+    assert manager.list_presets() == []
+    assert manager.save_preset('b')
+    assert manager.save_preset('a')
+    assert manager.list_presets() == ['a', 'b']
+    assert manager.delete_preset('b')
+    assert manager.list_presets() == ['a']
+
+
+def test_preset_list_sees_external_changes(tmp_path):
+    manager = ConfigManager(tmp_path)
+    assert manager.list_presets() == []
+    (manager.presets_dir / 'shared.json').write_text('{}', encoding='utf-8')
+    assert manager.list_presets() == ['shared']
+
+    # 返回的是副本，修改不影响缓存
+    manager.list_presets().append('bogus')
+    assert manager.list_presets() == ['shared']
+
+
+def test_cached_preset_list_is_invalidated_by_directory_mtime(tmp_path):
+    manager = ConfigManager(tmp_path)
+    manager.save_preset('old')
+    # 足够早的目录 mtime 才会被缓存
+    past_ns = manager.presets_dir.stat().st_mtime_ns - 60 * 10 ** 9
+    os.utime(manager.presets_dir, ns=(past_ns, past_ns))
+    assert manager.list_presets() == ['old']
+    assert manager._preset_cache is not None
+
+    (manager.presets_dir / 'new.json').write_text('{}', encoding='utf-8')
+    assert manager.list_presets() == ['new', 'old']
@@ -0,0 +1,125 @@
+"""
+MetricsCollector 增量结果缓存测试
+
+输入未变化的子分析器复用 results.json 中的结果；
+各子分析器签名覆盖的输入变化时，只重新运行对应的分析器。
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.analyzers import (
+    CodeQualityAnalyzer,
+    DependencyAnalyzer,
+    MetricsCollector,
+    ProjectAnalyzer,
+)
+from src.analyzers import base, code_quality_analyzer
+from src.analyzers.metrics_collector import _RESULTS_CACHE_FILE
+
+
+@pytest.fixture
+def project(tmp_path):
+    """包含 Python 源码与依赖清单的最小项目"""
+    (tmp_path / 'app.py').write_text('def main():\n    return 1\n', encoding='utf-8')
+    (tmp_path / 'gen').mkdir()
+    (tmp_path / 'gen' / 'model.py').write_text('X = 1\n', encoding='utf-8')
+    (tmp_path / 'requirements.txt').write_text('requests>=2.0\n', encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('notes\n', encoding='utf-8')
+    (tmp_path / '.gitignore').write_text('*.log\n', encoding='utf-8')
+    return tmp_path
+
+
+@pytest.fixture
+def recomputed(monkeypatch):
+    """记录每次 analyze 中实际运行的子分析器"""
+    names = []
+    for cls in (ProjectAnalyzer, CodeQualityAnalyzer, DependencyAnalyzer):
+        original = cls.analyze
+
+        def analyze(self, original=original):
+            names.append(type(self).__name__)
+            return original(self)
+
+        monkeypatch.setattr(cls, 'analyze', analyze)
+    return names
+
+
+def _run(project, recomputed, **kwargs):
+    """运行一次收集，返回本次重新运行的子分析器名称集合"""
+    recomputed.clear()
+    result = MetricsCollector(project, **kwargs).analyze()
+    assert result.errors == []
+    return set(recomputed)
+
+
+ALL = {'ProjectAnalyzer', 'CodeQualityAnalyzer', 'DependencyAnalyzer'}
+
+
+def test_unchanged_project_reuses_all_results(project, recomputed):
+    assert _run(project, recomputed) == ALL
+    assert (project / _RESULTS_CACHE_FILE).is_file()
+    assert _run(project, recomputed) == set()
+
+
+@pytest.mark.parametrize('change, expected', [
+    # Python 源码影响项目结构与代码质量
+    (lambda p: (p / 'app.py').write_text('def main():\n    return 2  # x\n', encoding='utf-8'),
+     {'ProjectAnalyzer', 'CodeQualityAnalyzer'}),
+    # 非 Python 文件只影响项目结构
+    (lambda p: (p / 'notes.txt').write_text('more notes\n', encoding='utf-8'),
+     {'ProjectAnalyzer'}),
+    # 依赖清单同时是项目文件
+    (lambda p: (p / 'requirements.txt').write_text('requests>=2.1\n', encoding='utf-8'),
+     {'ProjectAnalyzer', 'DependencyAnalyzer'}),
+    # .gitignore 决定参与质量分析的文件
+    (lambda p: (p / '.gitignore').write_text('gen/\n', encoding='utf-8'),
+     {'ProjectAnalyzer', 'CodeQualityAnalyzer'}),
+    # 子目录中的空目录只改变目录数
+    (lambda p: (p / 'gen' / 'empty').mkdir(),
+     {'ProjectAnalyzer'}),
+])
+def test_changed_inputs_rerun_only_affected_analyzers(project, recomputed, change, expected):
+    _run(project, recomputed)
+    change(project)
+    assert _run(project, recomputed) == expected
+    assert _run(project, recomputed) == set()
+
+
+def test_disabled_cache_writes_nothing(project, recomputed):
+    assert _run(project, recomputed, use_cache=False) == ALL
+    assert not (project / _RESULTS_CACHE_FILE.parent).exists()
+    assert _run(project, recomputed, use_cache=False) == ALL
+
+
+def test_corrupt_cache_file_is_ignored(project, recomputed):
+    _run(project, recomputed)
+    (project / _RESULTS_CACHE_FILE).write_text('{not json', encoding='utf-8')
+    assert _run(project, recomputed) == ALL
+    assert _run(project, recomputed) == set()
+
+
+def test_process_pools_start_without_other_threads(tmp_path, monkeypatch):
+    """多核时子分析器在主线程依次运行，进程池创建时进程内没有其他线程"""
+    for i in range(80):
+        (tmp_path / f'm{i}.py').write_text(f'def f{i}():\n    return {i}\n', encoding='utf-8')
+
+    thread_counts = []
+
+    class RecordingPool:
+        def __init__(self, *args, **kwargs):
+            thread_counts.append(threading.active_count())
+            # 进程池不可用时分析器回退到串行处理
+            raise OSError('pool disabled in test')
+
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(base, 'ProcessPoolExecutor', RecordingPool)
+    monkeypatch.setattr(code_quality_analyzer, 'ProcessPoolExecutor', RecordingPool)
+
+    result = MetricsCollector(tmp_path, use_cache=False).analyze()
+    assert result.errors == []
+    assert result.data['quality']['python_analysis']['total_files'] == 80
+    assert len(thread_counts) == 2
+    assert set(thread_counts) == {threading.active_count()}